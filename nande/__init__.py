@@ -1,3 +1,5 @@
+import os
+
 import numpy as np
 import PyOpenColorIO as OCIO
 
@@ -5,12 +7,139 @@ __version__ = "0.1.0"
 
 
 class BitDepth:
+    """
+    Bit depth policy of an image.
+
+    The image is kept at its native dtype, which has to be one of
+    SUPPORTED, and only converted to 8-bit for display. Images of other
+    dtypes are converted once with to_supported.
+
+    """
     STD = np.uint8
     HALF = np.float16
     FLOAT = np.float32
+    # Dtypes every operation and OCIO read natively
+    SUPPORTED = (
+        np.dtype(STD),
+        np.dtype(np.uint16),
+        np.dtype(HALF),
+        np.dtype(FLOAT),
+    )
+
+    def __init__(self, native: np.dtype = STD):
+        self.native = np.dtype(native)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(native={self.native})"
+
+    @classmethod
+    def from_image(cls, image: np.ndarray) -> "BitDepth":
+        return cls(image.dtype)
+
+    @classmethod
+    def to_supported(cls, image: np.ndarray) -> np.ndarray:
+        """
+        Returns the image as is when its dtype is supported, otherwise a
+        float32 copy. Integers are normalized to 0-1 (negative values clip
+        to black on display), other floats keep their values.
+
+        """
+        if image.dtype in cls.SUPPORTED:
+            return image
+
+        if image.dtype.kind in "iu":
+            converted = image.astype(cls.FLOAT)
+            converted *= 1.0 / np.iinfo(image.dtype).max
+            return converted
+
+        return image.astype(cls.FLOAT)
+
+    @property
+    def is_float(self) -> bool:
+        return self.native.kind == "f"
+
+    @property
+    def scale(self) -> float:
+        """
+        Factor to bring native values into the 0-255 range.
+
+        """
+        if self.is_float:
+            return 255.0
+
+        return 255.0 / np.iinfo(self.native).max
+
+    def to_std(self, image: np.ndarray) -> np.ndarray:
+        """
+        Returns the 8-bit display image, the image itself when it already is
+        8-bit.
+
+        """
+        if self.native == self.STD:
+            return image
+
+        if self.native == np.uint16:
+            return (image >> 8).astype(self.STD)
+
+        return np.clip(image * self.scale, 0, 255).astype(self.STD)
+
+
+OCIO_DEFAULT_CONFIG = "ocio://default"
+
+# Parsed OCIO configs per path, only loaded on first use
+_ocio_configs: dict[str, OCIO.Config] = {}
+_ocio_config_path: str | None = None
+
+
+def get_ocio_config_path() -> str:
+    """
+    Returns the path of the session config: the path set with
+    set_ocio_config_path, else $OCIO, else the default builtin config.
+
+    """
+    return _ocio_config_path or os.environ.get("OCIO") or OCIO_DEFAULT_CONFIG
+
+
+def set_ocio_config_path(path: str | None):
+    """
+    Set the session config path, None falls back to $OCIO or the default
+    builtin config.
+
+    """
+    global _ocio_config_path
+    _ocio_config_path = path
+
+
+def get_ocio_config(path: str | None = None) -> OCIO.Config:
+    """
+    Returns the config of the given path (file path or ocio:// builtin URI),
+    the session config by default. Each config is parsed once.
+
+    """
+    path = path or get_ocio_config_path()
+    config = _ocio_configs.get(path)
+    if config is None:
+        config = OCIO.Config.CreateFromFile(path)
+        _ocio_configs[path] = config
+
+    return config
+
+
+def get_builtin_ocio_configs() -> dict[str, str]:
+    """
+    Returns the ocio:// URI and UI name of the builtin configs.
+
+    """
+    registry = OCIO.BuiltinConfigRegistry()
+    return {
+        f"ocio://{name}": ui_name
+        for name, ui_name, *_ in registry.getBuiltinConfigs()
+    }
 
 
-BIT_DEPTH = BitDepth.FLOAT
+def __getattr__(name: str):
+    # Keep nande.OCIO_CONFIG working without parsing the config on import
+    if name == "OCIO_CONFIG":
+        return get_ocio_config()
 
-# FIXME: For now leave this hardcode. Need to allow user to specify their config
-OCIO_CONFIG: OCIO.Config = OCIO.Config.CreateFromFile("ocio://default")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
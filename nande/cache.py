@@ -0,0 +1,162 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+
+class LRUCache:
+    """
+    Least recently used cache with hit/miss counters.
+
+    Besides the item count, the cache can be bounded by a memory budget in
+    bytes, in which case sizeof is used to weigh each value. Every method
+    is thread safe, get_or_create runs the factory outside of the lock so
+    slow builds don't block other threads (two threads missing the same key
+    may both build it, the first stored value wins).
+
+    """
+    def __init__(
+            self,
+            max_size: int = 32,
+            max_bytes: int | None = None,
+            sizeof: Callable[[Any], int] | None = None,
+    ):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits: int = 0
+        self.misses: int = 0
+        self.nbytes: int = 0
+        self._items: OrderedDict = OrderedDict()
+        self._sizes: dict = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key: Hashable, value: Any):
+        size = self.sizeof(value) if self.sizeof else 0
+        with self._lock:
+            self._put(key, value, size)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._pop(key, default)
+
+    def _put(self, key: Hashable, value: Any, size: int):
+        self._pop(key)
+        self._items[key] = value
+        self._sizes[key] = size
+        self.nbytes += size
+        self._evict()
+
+    def _pop(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self._items:
+            return default
+
+        self.nbytes -= self._sizes.pop(key)
+        return self._items.pop(key)
+
+    def _evict(self):
+        # Always keep the most recent item even if it is over budget
+        while len(self._items) > 1 and (
+                len(self._items) > self.max_size
+                or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            key = next(iter(self._items))
+            self._pop(key)
+
+    def set_max_bytes(self, max_bytes: int | None):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._items:
+                self.hits += 1
+                self._items.move_to_end(key)
+                return self._items[key]
+
+            self.misses += 1
+
+        value = factory()
+        size = self.sizeof(value) if self.sizeof else 0
+        with self._lock:
+            if key in self._items:
+                # Built concurrently by another thread, keep a single value
+                self._items.move_to_end(key)
+                return self._items[key]
+
+            self._put(key, value, size)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._items),
+                "max_size": self.max_size,
+                "nbytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class BufferPool:
+    """
+    Preallocated output buffers reused across frames.
+
+    Each slot holds one buffer which is only reallocated when the requested
+    shape or dtype changes (e.g. a new image got loaded), so repeated
+    operations on the same image don't allocate.
+
+    """
+    def __init__(self):
+        self.allocations: int = 0
+        self._buffers: dict[Hashable, np.ndarray] = {}
+
+    def get(self, slot: Hashable, shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        buffer = self._buffers.get(slot)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[slot] = buffer
+            self.allocations += 1
+
+        return buffer
+
+    def clear(self):
+        self._buffers.clear()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+    def stats(self) -> dict:
+        return {
+            "slots": len(self._buffers),
+            "nbytes": self.nbytes,
+            "allocations": self.allocations,
+        }
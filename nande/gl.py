@@ -0,0 +1,438 @@
+import numpy as np
+from PySide6.QtCore import QRectF, QSize
+from PySide6.QtGui import QMatrix4x4, QOpenGLContext, QPainter
+from PySide6.QtOpenGL import (
+    QOpenGLBuffer,
+    QOpenGLShader,
+    QOpenGLShaderProgram,
+    QOpenGLTexture,
+)
+from PySide6.QtWidgets import QWidget
+
+from nande.graph import ADJUST_NONE, INVERT_COLOR, INVERT_NONE
+from nande.utils import OCIO_LUT_HDR_STOPS, OCIO_LUT_SHAPER, ChannelEnum
+
+# Baked OCIO LUT size used when the viewer uses the exact processor on CPU
+GL_LUT_SIZE = 65
+
+GL_FLOAT = 0x1406
+GL_TRIANGLE_STRIP = 0x0005
+GL_BLEND = 0x0BE2
+GL_SRC_ALPHA = 0x0302
+GL_ONE_MINUS_SRC_ALPHA = 0x0303
+GL_MAX_TEXTURE_SIZE = 0x0D33
+
+# Result of is_gl_available, probed once
+_GL_AVAILABLE: bool | None = None
+
+VERTEX_SHADER = """
+attribute highp vec2 position;
+uniform highp mat4 matrix;
+uniform highp vec2 size;
+varying highp vec2 uv;
+
+void main()
+{
+    uv = position;
+    gl_Position = matrix * vec4(position * size, 0.0, 1.0);
+}
+"""
+
+# Mirrors the CPU operations of the image graph, see nande.utils
+FRAGMENT_SHADER = """
+#ifdef GL_ES
+precision highp float;
+#endif
+
+uniform sampler2D image;
+uniform sampler3D lut;
+uniform bool isolate;
+uniform vec4 weights;
+uniform int invert;
+uniform bool adjust;
+// brightness, contrast, exposure, gamma
+uniform vec4 adjustments;
+uniform bool use_lut;
+uniform float lut_size;
+uniform float lut_shaper;
+// Float image going straight to a LUT baked over the HDR (log2) domain
+uniform bool hdr;
+uniform vec2 lut_stops;
+varying highp vec2 uv;
+
+void main()
+{
+    vec4 color = texture2D(image, uv);
+    if (!hdr) {
+        // Every CPU operation works on the clipped 8-bit image
+        color = clamp(color, 0.0, 1.0);
+    }
+
+    if (isolate) {
+        // Isolating the alpha channel shows it opaque
+        float value = dot(color, weights);
+        color = vec4(vec3(value), weights.a > 0.0 ? 1.0 : color.a);
+    }
+
+    if (invert != 0) {
+        vec4 inverted = invert == 1
+            ? 1.0 - color
+            : pow(1.0 - pow(color, vec4(2.2)), vec4(1.0 / 2.2));
+        color = vec4(inverted.rgb, color.a);
+    }
+
+    if (adjust) {
+        vec3 value = color.rgb * exp2(adjustments.z);
+        value = (value - 0.5) * (1.0 + adjustments.y) + 0.5 + adjustments.x;
+        color.rgb = pow(clamp(value, 0.0, 1.0), vec3(1.0 / adjustments.w));
+    }
+
+    if (use_lut) {
+        // The LUT is baked for BGR images, indexed [b][g][r] and gives BGR
+        vec3 coords;
+        if (hdr) {
+            vec3 value = clamp(color.rgb, exp2(lut_stops.x), exp2(lut_stops.y));
+            coords = (log2(value) - lut_stops.x) / (lut_stops.y - lut_stops.x);
+        } else {
+            coords = pow(color.rgb, vec3(1.0 / lut_shaper));
+        }
+        coords = coords * ((lut_size - 1.0) / lut_size) + 0.5 / lut_size;
+        color.rgb = texture3D(lut, coords).bgr;
+    }
+
+    gl_FragColor = color;
+}
+"""
+
+
+def is_gl_available() -> bool:
+    """
+    Returns True when an OpenGL context can be created on this platform.
+    The platform is only probed on the first call.
+
+    """
+    global _GL_AVAILABLE
+    if _GL_AVAILABLE is None:
+        _GL_AVAILABLE = QOpenGLContext().create()
+
+    return _GL_AVAILABLE
+
+
+def get_texture_data(image: np.ndarray) -> np.ndarray:
+    """
+    Returns the BGRA texture data of the image normalized to 0-1.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        Gray, BGR or BGRA image of any supported bit depth
+
+    Returns
+    -------
+    np.ndarray
+        (H, W, 4) half-float array for 8-bit and half-float images, float32
+        otherwise so 16-bit and float images keep their precision
+
+    """
+    if image.ndim == 2:
+        image = image[..., np.newaxis]
+
+    h, w, channels = image.shape
+    dtype = np.float16 if image.dtype in (np.uint8, np.float16) else np.float32
+    scale = 1.0 if image.dtype.kind == "f" else 1.0 / np.iinfo(image.dtype).max
+
+    data = np.empty((h, w, 4), dtype=dtype)
+    colors = image[..., :3] if channels >= 3 else image[..., :1]
+    np.multiply(colors, scale, out=data[..., :3], casting="unsafe")
+    if channels > 3:
+        np.multiply(image[..., 3], scale, out=data[..., 3], casting="unsafe")
+    else:
+        data[..., 3] = 1.0
+
+    return data
+
+
+def get_channel_weights(channel: int | None) -> tuple[float, float, float, float]:
+    """
+    Returns the RGBA weights giving the gray value of the isolated channel.
+
+    """
+    if channel == ChannelEnum.LUMINANCE:
+        # Same weights as utils._get_rec709_luma_fast_approx
+        return 0.33, 0.5, 0.16, 0.0
+
+    weights = [0.0, 0.0, 0.0, 0.0]
+    if channel is not None:
+        weights[channel] = 1.0
+
+    return tuple(weights)
+
+
+class GLImageRenderer:
+    """
+    Draws an image texture through the display shader.
+
+    The image is uploaded once and every operation (channel isolation,
+    invert, tone adjustments and the OCIO display transform as a 3D LUT
+    texture) runs in the fragment shader, so changing an operation only
+    updates uniforms. GL resources are created lazily in the context of the
+    first paint and released with it.
+
+    """
+    def __init__(self):
+        self.failed: str | None = None
+        self._image: np.ndarray | None = None
+        self._lut: np.ndarray | None = None
+        self._channel: int | None = None
+        self._invert: str | None = INVERT_NONE
+        self._adjustments: tuple[float, ...] = ADJUST_NONE
+        self._hdr: bool = False
+
+        self._context: QOpenGLContext | None = None
+        self._widget: QWidget | None = None
+        self._program: QOpenGLShaderProgram | None = None
+        self._vertices: QOpenGLBuffer | None = None
+        self._texture: QOpenGLTexture | None = None
+        self._lut_texture: QOpenGLTexture | None = None
+        self._image_dirty: bool = True
+        self._lut_dirty: bool = True
+
+    def set_image(self, image: np.ndarray):
+        self._image = image
+        self._image_dirty = True
+
+    def get_image_size(self) -> QSize:
+        if self._image is None:
+            return QSize()
+
+        h, w = self._image.shape[:2]
+        return QSize(w, h)
+
+    def set_operations(
+            self,
+            channel: int | None = None,
+            invert: str | None = INVERT_NONE,
+            adjustments: tuple[float, ...] = ADJUST_NONE,
+            lut: np.ndarray | None = None,
+            hdr: bool = False,
+    ):
+        """
+        Parameters
+        ----------
+        channel : int | None
+            Isolated ChannelEnum channel
+        invert : str | None
+            Invert mode of the image graph
+        adjustments : tuple[float, ...]
+            (brightness, contrast, exposure, gamma)
+        lut : np.ndarray | None
+            OCIO display transform baked with utils.bake_ocio_lut
+        hdr : bool
+            The image goes unclipped through a LUT baked over the HDR
+            domain, only when no other operation is active
+
+        """
+        self._channel = channel
+        self._hdr = hdr
+        self._invert = invert
+        self._adjustments = tuple(adjustments)
+        if lut is not self._lut:
+            self._lut = lut
+            self._lut_dirty = True
+
+    def draw(self, painter: QPainter, widget: QWidget | None, linear: bool):
+        """
+        Draw the image over (0, 0, width, height) in item coordinates. Must
+        be called between painter.beginNativePainting and
+        painter.endNativePainting.
+
+        Raises
+        ------
+        RuntimeError
+            When the GL resources can't be created, the caller is expected
+            to fall back to the CPU path
+
+        """
+        context = QOpenGLContext.currentContext()
+        if context is None:
+            raise RuntimeError("No current OpenGL context")
+
+        if context is not self._context:
+            self.release()
+            self._create(context, widget)
+
+        if self._image_dirty:
+            self._upload_image(context)
+
+        if self._lut_dirty:
+            self._upload_lut()
+
+        filter_ = QOpenGLTexture.Filter.Linear if linear else QOpenGLTexture.Filter.Nearest
+        self._texture.setMinMagFilters(filter_, filter_)
+
+        h, w = self._image.shape[:2]
+        matrix = QMatrix4x4()
+        matrix.ortho(QRectF(painter.viewport()))
+        matrix *= QMatrix4x4(painter.combinedTransform())
+
+        gl = context.functions()
+        gl.glEnable(GL_BLEND)
+        gl.glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+        program = self._program
+        program.bind()
+        self._vertices.bind()
+        program.enableAttributeArray(0)
+        program.setAttributeBuffer(0, GL_FLOAT, 0, 2)
+
+        self._texture.bind(0)
+        if self._lut_texture is not None:
+            self._lut_texture.bind(1)
+
+        self._set_uniforms(program, matrix, w, h)
+        gl.glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
+
+        if self._lut_texture is not None:
+            self._lut_texture.release(1)
+        self._texture.release(0)
+        program.disableAttributeArray(0)
+        self._vertices.release()
+        program.release()
+
+    def _set_uniforms(self, program: QOpenGLShaderProgram, matrix: QMatrix4x4, w: int, h: int):
+        isolate = self._channel is not None
+        use_lut = self._lut is not None and not isolate
+
+        program.setUniformValue(b"matrix", matrix)
+        program.setUniformValue(b"size", float(w), float(h))
+        program.setUniformValue1i(b"image", 0)
+        program.setUniformValue1i(b"lut", 1)
+
+        program.setUniformValue1i(b"isolate", int(isolate))
+        program.setUniformValue(b"weights", *get_channel_weights(self._channel))
+
+        invert = 0
+        if self._invert is not INVERT_NONE:
+            invert = 1 if self._invert == INVERT_COLOR else 2
+        program.setUniformValue1i(b"invert", invert)
+
+        program.setUniformValue1i(b"adjust", int(self._adjustments != ADJUST_NONE))
+        program.setUniformValue(b"adjustments", *map(float, self._adjustments))
+
+        program.setUniformValue1i(b"use_lut", int(use_lut))
+        lut_size = self._lut.shape[0] if self._lut is not None else 1
+        program.setUniformValue1f(b"lut_size", float(lut_size))
+        program.setUniformValue1f(b"lut_shaper", float(OCIO_LUT_SHAPER))
+        program.setUniformValue1i(b"hdr", int(use_lut and self._hdr))
+        program.setUniformValue(b"lut_stops", *map(float, OCIO_LUT_HDR_STOPS))
+
+    def _create(self, context: QOpenGLContext, widget: QWidget | None):
+        program = QOpenGLShaderProgram()
+        for shader_type, source in (
+                (QOpenGLShader.ShaderTypeBit.Vertex, VERTEX_SHADER),
+                (QOpenGLShader.ShaderTypeBit.Fragment, FRAGMENT_SHADER),
+        ):
+            if not program.addShaderFromSourceCode(shader_type, source):
+                raise RuntimeError(f"Unable to compile shader: {program.log()}")
+
+        program.bindAttributeLocation(b"position", 0)
+        if not program.link():
+            raise RuntimeError(f"Unable to link shader: {program.log()}")
+
+        # Unit quad, scaled to the image size in the vertex shader
+        quad = np.array([0, 0, 1, 0, 0, 1, 1, 1], dtype=np.float32)
+        vertices = QOpenGLBuffer(QOpenGLBuffer.Type.VertexBuffer)
+        vertices.create()
+        vertices.bind()
+        vertices.allocate(quad.tobytes(), quad.nbytes)
+        vertices.release()
+
+        self._context = context
+        self._widget = widget
+        self._program = program
+        self._vertices = vertices
+        self._image_dirty = True
+        self._lut_dirty = True
+        context.aboutToBeDestroyed.connect(self._on_context_destroyed)
+
+    def _upload_image(self, context: QOpenGLContext):
+        h, w = self._image.shape[:2]
+        max_size = context.functions().glGetIntegerv(GL_MAX_TEXTURE_SIZE)
+        if max(w, h) > max_size:
+            raise RuntimeError(f"Image of {w}x{h} exceeds the {max_size} texture size limit")
+
+        data = get_texture_data(self._image)
+        if data.dtype == np.float16:
+            texture_format = QOpenGLTexture.TextureFormat.RGBA16F
+            pixel_type = QOpenGLTexture.PixelType.Float16
+        else:
+            texture_format = QOpenGLTexture.TextureFormat.RGBA32F
+            pixel_type = QOpenGLTexture.PixelType.Float32
+
+        self._destroy_texture(self._texture)
+        texture = QOpenGLTexture(QOpenGLTexture.Target.Target2D)
+        texture.setFormat(texture_format)
+        texture.setSize(w, h)
+        texture.setMipLevels(1)
+        texture.allocateStorage(QOpenGLTexture.PixelFormat.BGRA, pixel_type)
+        texture.setData(QOpenGLTexture.PixelFormat.BGRA, pixel_type, data.ctypes.data)
+        texture.setWrapMode(QOpenGLTexture.WrapMode.ClampToEdge)
+        if not texture.isStorageAllocated():
+            raise RuntimeError("Unable to allocate the image texture")
+
+        self._texture = texture
+        self._image_dirty = False
+
+    def _upload_lut(self):
+        self._destroy_texture(self._lut_texture)
+        self._lut_texture = None
+        self._lut_dirty = False
+        if self._lut is None:
+            return
+
+        lut = np.ascontiguousarray(self._lut, dtype=np.float32)
+        size = lut.shape[0]
+        texture = QOpenGLTexture(QOpenGLTexture.Target.Target3D)
+        texture.setFormat(QOpenGLTexture.TextureFormat.RGB32F)
+        texture.setSize(size, size, size)
+        texture.setMipLevels(1)
+        texture.allocateStorage(QOpenGLTexture.PixelFormat.RGB, QOpenGLTexture.PixelType.Float32)
+        texture.setData(QOpenGLTexture.PixelFormat.RGB, QOpenGLTexture.PixelType.Float32, lut.ctypes.data)
+        texture.setWrapMode(QOpenGLTexture.WrapMode.ClampToEdge)
+        texture.setMinMagFilters(QOpenGLTexture.Filter.Linear, QOpenGLTexture.Filter.Linear)
+        self._lut_texture = texture
+
+    @staticmethod
+    def _destroy_texture(texture: QOpenGLTexture | None):
+        if texture is not None:
+            texture.destroy()
+
+    def _on_context_destroyed(self):
+        # The context is gone with its viewport, release while it's current
+        if self._widget is not None:
+            self._widget.makeCurrent()
+
+        self.release()
+
+    def release(self):
+        """
+        Destroy the GL resources, they get created again on the next draw.
+
+        """
+        if self._context is None:
+            return
+
+        self._context.aboutToBeDestroyed.disconnect(self._on_context_destroyed)
+        self._destroy_texture(self._texture)
+        self._destroy_texture(self._lut_texture)
+        if self._vertices is not None:
+            self._vertices.destroy()
+
+        self._context = None
+        self._widget = None
+        self._program = None
+        self._vertices = None
+        self._texture = None
+        self._lut_texture = None
+        self._image_dirty = True
+        self._lut_dirty = True
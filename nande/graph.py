@@ -0,0 +1,383 @@
+from functools import partial
+from typing import Any, Callable
+
+import numpy as np
+
+from nande import BitDepth, get_ocio_config, get_ocio_config_path
+from nande.cache import BufferPool
+from nande.utils import (
+    ChannelEnum,
+    adjust_image,
+    get_channel,
+    get_invert_color,
+    get_invert_linear_color,
+    get_luminance,
+    ocio_transform,
+)
+
+INVERT_NONE = None
+INVERT_COLOR = "color"
+INVERT_LINEAR_COLOR = "linear"
+
+# (brightness, contrast, exposure, gamma)
+ADJUST_NONE = (0.0, 0.0, 0.0, 1.0)
+
+
+class Node:
+    """
+    Operation of the image graph.
+
+    The result is cached until one of the node parameters or an upstream
+    node changes, in which case the node and every downstream node are
+    marked dirty and re-evaluated on the next request. A bypassed node
+    forwards its input as is.
+
+    """
+    def __init__(
+            self,
+            name: str,
+            func: Callable[..., np.ndarray],
+            source: "Node | None" = None,
+            bypass: Callable[..., bool] | None = None,
+            **params,
+    ):
+        """
+        Parameters
+        ----------
+        name : str
+            Node name, also the name of its output buffer slot
+        func : Callable
+            Called with the input image, pooled and the node parameters as
+            keywords. pooled is False when the result must be a fresh array
+            (e.g. a region processed off the GUI thread)
+        source : Node | None
+            Upstream node
+        bypass : Callable | None
+            Called with the node parameters, the node forwards its input
+            when it returns True
+
+        """
+        self.name = name
+        self.func = func
+        self.source = source
+        self.bypass = bypass
+        self.params: dict[str, Any] = params
+        self.evaluations: int = 0
+        self._outputs: list[Node] = []
+        self._result: np.ndarray | None = None
+        if source is not None:
+            source._outputs.append(self)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name}, {self.params})"
+
+    def is_bypassed(self) -> bool:
+        return self.bypass is not None and self.bypass(**self.params)
+
+    def set_params(self, **params) -> bool:
+        """
+        Update the parameters, returns True if any of them changed.
+
+        """
+        changed = {
+            key: value
+            for key, value in params.items()
+            if key not in self.params or _is_changed(self.params[key], value)
+        }
+        if not changed:
+            return False
+
+        self.params.update(changed)
+        self.mark_dirty()
+        return True
+
+    def mark_dirty(self):
+        self._result = None
+        for node in self._outputs:
+            node.mark_dirty()
+
+    def evaluate(self) -> np.ndarray | None:
+        image = self.source.evaluate() if self.source is not None else None
+        if self.is_bypassed():
+            return image
+
+        if self._result is None:
+            self._result = self.func(image, pooled=True, **self.params)
+            self.evaluations += 1
+
+        return self._result
+
+
+class ImageGraph:
+    """
+    Lazy graph of the operations producing the displayed image:
+
+        source -> bit depth -> channel -> invert -> adjust -> ocio
+
+    Every operation composes with the others and changing a parameter only
+    re-evaluates the nodes downstream of it. The OCIO node is bypassed while
+    a channel is isolated. Intermediate results live in per node buffers
+    which are reused until the image size changes.
+
+    """
+    def __init__(self):
+        self.buffer_pool = BufferPool()
+        self._bit_depth = BitDepth()
+        self._display_image: np.ndarray | None = None
+
+        self.source = Node(
+            "source",
+            lambda _, pooled, image: image,
+            image=np.zeros((1, 1), dtype=BitDepth.STD),
+        )
+        self.bit_depth = Node(
+            "bit_depth",
+            self._convert_bit_depth,
+            self.source,
+            bypass=lambda native: native,
+            native=False,
+        )
+        self.channel = Node(
+            "channel",
+            self._isolate_channel,
+            self.bit_depth,
+            bypass=lambda channel: channel is None,
+            channel=None,
+        )
+        self.invert = Node(
+            "invert",
+            self._invert,
+            self.channel,
+            bypass=lambda mode: mode is INVERT_NONE,
+            mode=INVERT_NONE,
+        )
+        self.adjust = Node(
+            "adjust",
+            self._adjust,
+            self.invert,
+            bypass=lambda adjustments: adjustments == ADJUST_NONE,
+            adjustments=ADJUST_NONE,
+        )
+        self.ocio = Node(
+            "ocio",
+            self._ocio_transform,
+            self.adjust,
+            # Isolated channels are data, not color, don't display transform them
+            bypass=lambda enabled, **_: not enabled or self.get_channel() is not None,
+            enabled=False,
+            display=None,
+            view=None,
+            lut_size=None,
+            config=None,
+            config_id=None,
+        )
+        self.nodes: tuple[Node, ...] = (
+            self.source,
+            self.bit_depth,
+            self.channel,
+            self.invert,
+            self.adjust,
+            self.ocio,
+        )
+
+    def set_image(self, image: np.ndarray, bit_depth: BitDepth | None = None):
+        self._bit_depth = bit_depth or BitDepth.from_image(image)
+        self._display_image = None
+        self.buffer_pool.clear()
+        self.source.set_params(image=image)
+
+    def get_image(self) -> np.ndarray:
+        return self.source.params["image"]
+
+    def get_bit_depth(self) -> BitDepth:
+        return self._bit_depth
+
+    def get_display_image(self) -> np.ndarray:
+        """
+        Returns the 8-bit image, which is the source image itself for 8-bit
+        sources.
+
+        """
+        if self._display_image is None:
+            self._display_image = self._bit_depth.to_std(self.get_image())
+
+        return self._display_image
+
+    def set_channel(self, channel: int | None):
+        self.channel.set_params(channel=channel)
+        self._update_routing()
+
+    def set_invert(self, mode: str | None):
+        self.invert.set_params(mode=mode)
+        self._update_routing()
+
+    def set_adjustments(self, adjustments: tuple[float, ...]):
+        self.adjust.set_params(adjustments=tuple(adjustments))
+        self._update_routing()
+
+    def set_ocio(
+            self,
+            enabled: bool,
+            display: str | None = None,
+            view: str | None = None,
+            lut_size: int | None = None,
+            config: str | None = None,
+    ):
+        """
+        Set the OCIO display transform, config is a config path and defaults
+        to the session config.
+
+        The config is resolved to its path and cache ID while enabled, so
+        results (and keys) of another config, e.g. after the session config
+        changed, are never reused. Raises when the config can't be loaded.
+
+        """
+        config_id = None
+        if enabled:
+            config = config or get_ocio_config_path()
+            config_id = get_ocio_config(config).getCacheID()
+
+        self.ocio.set_params(
+            enabled=enabled,
+            display=display,
+            view=view,
+            lut_size=lut_size,
+            config=config,
+            config_id=config_id,
+        )
+        self._update_routing()
+
+    def get_channel(self) -> int | None:
+        return self.channel.params["channel"]
+
+    def get_invert(self) -> str | None:
+        return self.invert.params["mode"]
+
+    def get_adjustments(self) -> tuple[float, ...]:
+        return self.adjust.params["adjustments"]
+
+    def _update_routing(self):
+        # OCIO gets the source image at its native bit depth when nothing in
+        # between needs the 8-bit image, no float promotion is needed and high
+        # bit depth sources keep their precision
+        native = not self.ocio.is_bypassed() and all(
+            node.is_bypassed() for node in (self.channel, self.invert, self.adjust)
+        )
+        self.bit_depth.set_params(native=native)
+
+    def is_identity(self) -> bool:
+        """
+        Returns True when the output is the plain 8-bit display image.
+
+        """
+        return all(node.is_bypassed() for node in self.nodes[2:])
+
+    def key(self) -> tuple:
+        """
+        Returns a hashable description of the active operations.
+
+        """
+        return tuple(
+            (node.name, tuple(node.params.values()))
+            for node in self.nodes[2:]
+            if not node.is_bypassed()
+        )
+
+    def evaluate(self) -> np.ndarray:
+        return self.ocio.evaluate()
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        """
+        Run every operation on a region of the source image, nothing is
+        cached and fresh buffers are returned.
+
+        """
+        for operation in self.get_operations():
+            image = operation(image)
+
+        return image
+
+    def get_operations(self) -> list[Callable[[np.ndarray], np.ndarray]]:
+        """
+        Returns the active operations bound to a snapshot of their current
+        parameters, safe to run from another thread.
+
+        """
+        return [
+            partial(node.func, pooled=False, **node.params)
+            for node in self.nodes[1:]
+            if not node.is_bypassed()
+        ]
+
+    def is_heavy(self) -> bool:
+        """
+        Returns True when the active operations are too slow to run on a
+        large frame at interactive rates.
+
+        """
+        return not self.ocio.is_bypassed() or self.get_channel() == ChannelEnum.LUMINANCE
+
+    def stats(self) -> dict:
+        return {node.name: node.evaluations for node in self.nodes}
+
+    def _get_buffer(self, name: str, shape: tuple[int, ...], pooled: bool) -> np.ndarray | None:
+        if not pooled:
+            return None
+
+        return self.buffer_pool.get(name, shape, BitDepth.STD)
+
+    def _convert_bit_depth(self, image: np.ndarray, pooled: bool, native: bool) -> np.ndarray:
+        if image is not self.get_image():
+            return self._bit_depth.to_std(image)
+
+        return self.get_display_image()
+
+    def _isolate_channel(self, image: np.ndarray, pooled: bool, channel: int) -> np.ndarray:
+        out = self._get_buffer("channel", (*image.shape[:2], 4), pooled)
+        if channel == ChannelEnum.LUMINANCE:
+            return get_luminance(image, out=out)
+
+        return get_channel(image, channel, out=out)
+
+    def _invert(self, image: np.ndarray, pooled: bool, mode: str) -> np.ndarray:
+        out = self._get_buffer("invert", image.shape, pooled)
+        if mode == INVERT_LINEAR_COLOR:
+            return get_invert_linear_color(image, out=out)
+
+        return get_invert_color(image, out=out)
+
+    def _adjust(self, image: np.ndarray, pooled: bool, adjustments: tuple[float, ...]) -> np.ndarray:
+        out = self._get_buffer("adjust", image.shape, pooled)
+        return adjust_image(image, *adjustments, out=out)
+
+    def _ocio_transform(
+            self,
+            image: np.ndarray,
+            pooled: bool,
+            enabled: bool,
+            display: str | None,
+            view: str | None,
+            lut_size: int | None,
+            config: str | None,
+            config_id: str | None,
+    ) -> np.ndarray:
+        # Gray images come out of OCIO as BGR
+        shape = image.shape if image.ndim > 2 else (*image.shape, 3)
+        out = self._get_buffer("ocio", shape, pooled)
+        # Float images only reach OCIO at their native (0-1) range
+        return ocio_transform(
+            image,
+            view=view,
+            display=display,
+            lut_size=lut_size,
+            out=out,
+            scale=1.0,
+            config=get_ocio_config(config),
+        )
+
+
+def _is_changed(current: Any, value: Any) -> bool:
+    if isinstance(current, np.ndarray) or isinstance(value, np.ndarray):
+        return current is not value
+
+    return current != value
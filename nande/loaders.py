@@ -0,0 +1,195 @@
+import os
+import struct
+import sys
+
+import numpy as np
+
+MEMMAP_FORMATS = (
+    ".npy",
+    ".tif",
+    ".tiff",
+)
+
+# TIFF tags needed to locate uncompressed pixel data
+_TIFF_IMAGE_WIDTH = 256
+_TIFF_IMAGE_LENGTH = 257
+_TIFF_BITS_PER_SAMPLE = 258
+_TIFF_COMPRESSION = 259
+_TIFF_PHOTOMETRIC = 262
+_TIFF_STRIP_OFFSETS = 273
+_TIFF_SAMPLES_PER_PIXEL = 277
+_TIFF_STRIP_BYTE_COUNTS = 279
+_TIFF_PLANAR_CONFIG = 284
+_TIFF_TILE_WIDTH = 322
+_TIFF_SAMPLE_FORMAT = 339
+
+# TIFF field type -> (struct format, size)
+_TIFF_FIELD_TYPES = {
+    1: ("B", 1),
+    3: ("H", 2),
+    4: ("I", 4),
+    16: ("Q", 8),
+}
+# PhotometricInterpretation per samples per pixel which can be displayed as
+# is, BlackIsZero gray and RGB. WhiteIsZero, palette, CMYK, YCbCr... aren't
+_TIFF_PHOTOMETRICS = {
+    1: 1,
+    3: 2,
+}
+# (SampleFormat, BitsPerSample) -> dtype kind and size, only the depths
+# BitDepth and OCIO handle natively (no 32-bit integers)
+_TIFF_SAMPLE_TYPES = {
+    (1, 8): "u1",
+    (1, 16): "u2",
+    (3, 16): "f2",
+    (3, 32): "f4",
+}
+# Channel counts of (H, W, C) buffers which can be displayed as is
+_CHANNEL_COUNTS = (1, 3, 4)
+
+
+def open_npy(file_path: str) -> np.ndarray | None:
+    """
+    Memory map a .npy buffer. The buffer is expected to be (H, W) or
+    (H, W, C) in OpenCV BGR(A) channel order.
+
+    Returns None for anything else, like open_uncompressed_tiff: other
+    channel counts, non native byte orders and dtypes other than uint8,
+    uint16, float16 and float32.
+
+    """
+    image = np.load(file_path, mmap_mode="r")
+    if image.ndim == 3 and image.shape[2] == 1:
+        image = image[..., 0]
+
+    if image.ndim not in (2, 3) or (image.ndim == 3 and image.shape[2] not in _CHANNEL_COUNTS):
+        return None
+
+    dtype = image.dtype
+    if f"{dtype.kind}{dtype.itemsize}" not in _TIFF_SAMPLE_TYPES.values() or not dtype.isnative:
+        return None
+
+    return image
+
+
+def open_raw(
+        file_path: str,
+        shape: tuple[int, ...],
+        dtype: np.dtype,
+        offset: int = 0,
+) -> np.ndarray:
+    """
+    Memory map a headerless raw dump of the given shape and dtype, in
+    OpenCV BGR(A) channel order.
+
+    """
+    return np.memmap(file_path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+
+def _read_tiff_ifd(f, byte_order: str, offset: int) -> dict[int, tuple]:
+    f.seek(offset)
+    (count,) = struct.unpack(f"{byte_order}H", f.read(2))
+    tags = {}
+    for _ in range(count):
+        tag, field_type, n, value = struct.unpack(f"{byte_order}HHI4s", f.read(12))
+        if field_type not in _TIFF_FIELD_TYPES:
+            continue
+
+        fmt, size = _TIFF_FIELD_TYPES[field_type]
+        if n * size <= 4:
+            data = value[:n * size]
+        else:
+            (data_offset,) = struct.unpack(f"{byte_order}I", value)
+            position = f.tell()
+            f.seek(data_offset)
+            data = f.read(n * size)
+            f.seek(position)
+
+        tags[tag] = struct.unpack(f"{byte_order}{n}{fmt}", data)
+
+    return tags
+
+
+def open_uncompressed_tiff(file_path: str) -> np.ndarray | None:
+    """
+    Memory map the first image of a classic TIFF when its pixel data is
+    stored uncompressed, interleaved and in contiguous strips.
+
+    Returns None for anything else (compressed, tiled, planar, RGBA,
+    palette or WhiteIsZero, 32-bit integer samples) so the caller can fall
+    back to a regular decode. RGB data is returned as a reversed channel
+    view so it reads as BGR without copying.
+
+    """
+    with open(file_path, "rb") as f:
+        header = f.read(8)
+        if header[:2] == b"II":
+            byte_order = "<"
+        elif header[:2] == b"MM":
+            byte_order = ">"
+        else:
+            return None
+
+        magic, ifd_offset = struct.unpack(f"{byte_order}HI", header[2:])
+        if magic != 42:
+            return None
+
+        tags = _read_tiff_ifd(f, byte_order, ifd_offset)
+
+    compression = tags.get(_TIFF_COMPRESSION, (1,))[0]
+    planar = tags.get(_TIFF_PLANAR_CONFIG, (1,))[0]
+    if compression != 1 or planar != 1 or _TIFF_TILE_WIDTH in tags:
+        return None
+
+    width = tags[_TIFF_IMAGE_WIDTH][0]
+    height = tags[_TIFF_IMAGE_LENGTH][0]
+    channels = tags.get(_TIFF_SAMPLES_PER_PIXEL, (1,))[0]
+    bits = tags.get(_TIFF_BITS_PER_SAMPLE, (1,))
+    sample_format = tags.get(_TIFF_SAMPLE_FORMAT, (1,))[0]
+    photometric = tags.get(_TIFF_PHOTOMETRIC, (None,))[0]
+    if len(set(bits)) != 1 or photometric != _TIFF_PHOTOMETRICS.get(channels):
+        return None
+
+    sample_type = _TIFF_SAMPLE_TYPES.get((sample_format, bits[0]))
+    if sample_type is None:
+        return None
+
+    dtype = np.dtype(f"{byte_order}{sample_type}")
+    native_order = "<" if sys.byteorder == "little" else ">"
+    if dtype.itemsize > 1 and byte_order != native_order:
+        return None
+
+    offsets = tags[_TIFF_STRIP_OFFSETS]
+    counts = tags[_TIFF_STRIP_BYTE_COUNTS]
+    for i in range(len(offsets) - 1):
+        if offsets[i] + counts[i] != offsets[i + 1]:
+            return None
+
+    if sum(counts) < width * height * channels * dtype.itemsize:
+        return None
+
+    if channels == 1:
+        return np.memmap(file_path, dtype=dtype, mode="r", offset=offsets[0], shape=(height, width))
+
+    image = np.memmap(file_path, dtype=dtype, mode="r", offset=offsets[0], shape=(height, width, channels))
+    return image[..., ::-1]
+
+
+def open_memmap(file_path: str) -> np.ndarray | None:
+    """
+    Memory map the image if its format allows it, otherwise returns None.
+
+    """
+    _, ext = os.path.splitext(file_path)
+    ext = ext.lower()
+    if ext not in MEMMAP_FORMATS:
+        return None
+
+    try:
+        if ext == ".npy":
+            return open_npy(file_path)
+
+        return open_uncompressed_tiff(file_path)
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        print(f"Woops unable to memory map {file_path}! {e}")
+        return None
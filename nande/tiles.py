@@ -0,0 +1,156 @@
+import math
+from typing import Callable, Iterator
+
+import cv2
+import numpy as np
+from PySide6.QtCore import QRect, QRectF
+from PySide6.QtGui import QPixmap
+
+from nande.cache import LRUCache
+from nande.utils import get_nbytes, get_pixmap_from_ndarray
+
+TILE_SIZE = 512
+TILE_CACHE_MAX_BYTES = 256 * 1024 ** 2
+# Mip levels are halved until their longest side fits this size
+MIP_MIN_SIZE = 512
+
+
+def get_mip_level(scale: float, levels: int) -> int:
+    """
+    Returns the coarsest mip level that still has at least one texel per
+    screen pixel at the given scale, level 0 being full res.
+
+    """
+    if scale <= 0.0 or scale >= 1.0:
+        return 0
+
+    level = int(math.floor(math.log2(1.0 / scale)))
+    return min(level, levels - 1)
+
+
+def get_half_image(image: np.ndarray) -> np.ndarray:
+    """
+    Returns the image downsampled to half its size by area averaging.
+
+    """
+    height, width = image.shape[:2]
+    size = (max(math.ceil(width / 2), 1), max(math.ceil(height / 2), 1))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+class TilePyramid:
+    """
+    Mip pyramid of display tiles built lazily from the source image.
+
+    Level 0 is full res and every following level halves the resolution
+    until the whole image fits in a single tile. Tiles are only created when
+    requested and kept in an LRU cache bounded by a memory budget, so only
+    the tiles around the visible area at the current zoom stay resident.
+    Coarse tiles only read a strided subsample of their source region, full
+    res pixels are only touched by level 0 tiles.
+
+    """
+    def __init__(
+            self,
+            image: np.ndarray,
+            tile_size: int = TILE_SIZE,
+            max_bytes: int = TILE_CACHE_MAX_BYTES,
+            convert: Callable[[np.ndarray], np.ndarray] | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        image : np.ndarray
+            Source image, only read region by region
+        tile_size : int
+            Tile width and height in pixels at every level
+        max_bytes : int
+            Memory budget of the tile cache
+        convert : Callable | None
+            Converts a source region to the 8-bit display image before it
+            gets uploaded as a tile
+
+        """
+        self.image = image
+        self.tile_size = tile_size
+        self.convert = convert
+        self.height, self.width = image.shape[:2]
+
+        longest = max(self.width, self.height, 1)
+        self.levels: int = max(math.ceil(math.log2(longest / tile_size)), 0) + 1
+        self._tiles = LRUCache(
+            max_size=100000,
+            max_bytes=max_bytes,
+            sizeof=get_nbytes,
+        )
+
+    def set_max_bytes(self, max_bytes: int):
+        self._tiles.set_max_bytes(max_bytes)
+
+    def stats(self) -> dict:
+        return self._tiles.stats()
+
+    def level_for_scale(self, scale: float) -> int:
+        """
+        Returns the coarsest level that still has at least one texel per
+        screen pixel at the given scale.
+
+        """
+        return get_mip_level(scale, self.levels)
+
+    def tile_span(self, level: int) -> int:
+        """
+        Returns the tile size in full res (scene) pixels at the given level.
+
+        """
+        return self.tile_size << level
+
+    def tile_rect(self, level: int, tx: int, ty: int) -> QRect:
+        span = self.tile_span(level)
+        x = tx * span
+        y = ty * span
+        w = min(span, self.width - x)
+        h = min(span, self.height - y)
+        return QRect(x, y, w, h)
+
+    def visible_tiles(self, level: int, rect: QRectF) -> Iterator[tuple[int, int]]:
+        span = self.tile_span(level)
+        left = max(int(rect.left()) // span, 0)
+        top = max(int(rect.top()) // span, 0)
+        right = min(int(math.ceil(rect.right())), self.width - 1) // span
+        bottom = min(int(math.ceil(rect.bottom())), self.height - 1) // span
+
+        for ty in range(top, bottom + 1):
+            for tx in range(left, right + 1):
+                yield tx, ty
+
+    def get_tile(self, level: int, tx: int, ty: int) -> QPixmap:
+        return self._tiles.get_or_create(
+            (level, tx, ty),
+            lambda: self._build_tile(level, tx, ty),
+        )
+
+    def _build_tile(self, level: int, tx: int, ty: int) -> QPixmap:
+        rect = self.tile_rect(level, tx, ty)
+        # Coarse levels sample the source at twice their resolution and area
+        # average that, so any tile reads and converts about four tiles worth
+        # of pixels instead of its whole full res span
+        step = max((1 << level) >> 1, 1)
+        region = self.image[
+            rect.top():rect.top() + rect.height():step,
+            rect.left():rect.left() + rect.width():step,
+        ]
+        if step > 1:
+            region = np.ascontiguousarray(region)
+
+        if self.convert:
+            region = self.convert(region)
+
+        if level:
+            size = (
+                max(math.ceil(rect.width() / (1 << level)), 1),
+                max(math.ceil(rect.height() / (1 << level)), 1),
+            )
+            region = cv2.resize(region, size, interpolation=cv2.INTER_AREA)
+
+        return get_pixmap_from_ndarray(region)
@@ -1,14 +1,69 @@
+import ctypes
+import os
+import sys
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable
 
 import cv2
 import numba
 import numpy as np
 import PyOpenColorIO as OCIO
-from PySide6.QtGui import QImage, QPixmap
+import shiboken6
+from PySide6.QtGui import QImage, QPixmap, QPolygonF
 from numba import jit
 
-from nande import BitDepth, OCIO_CONFIG
+from nande import BitDepth, get_ocio_config
+from nande.cache import BufferPool, LRUCache
+
+OCIO_PROCESSOR_CACHE = LRUCache(max_size=32)
+OCIO_LUT_CACHE = LRUCache(max_size=8)
+# 1D tables of tone operators (gamma, invert, ...) per bit depth
+LUT_REGISTRY = LRUCache(max_size=64)
+# Tone adjustment tables change with every slider tick, only the last few
+# are kept so they don't evict the fixed tables of LUT_REGISTRY
+ADJUST_LUT_CACHE = LRUCache(max_size=4)
+# Baked LUTs are sampled on a x ** (1 / OCIO_LUT_SHAPER) grid to spend more
+# samples in the shadows where display transforms curve the most
+OCIO_LUT_SHAPER = 2.0
+# LUTs of float (scene linear, HDR) images are sampled on a log2 grid over
+# these stops instead, so highlights above 1.0 keep their rolloff
+OCIO_LUT_HDR_STOPS = (-12.0, 6.0)
+# numpy dtypes OCIO processors can read and write in place
+OCIO_BIT_DEPTHS = {
+    np.dtype(np.uint8): OCIO.BIT_DEPTH_UINT8,
+    np.dtype(np.uint16): OCIO.BIT_DEPTH_UINT16,
+    np.dtype(np.float16): OCIO.BIT_DEPTH_F16,
+    np.dtype(np.float32): OCIO.BIT_DEPTH_F32,
+}
+# Swaps the red and blue channels, alpha untouched
+_OCIO_SWAP_RB = [
+    0.0, 0.0, 1.0, 0.0,
+    0.0, 1.0, 0.0, 0.0,
+    1.0, 0.0, 0.0, 0.0,
+    0.0, 0.0, 0.0, 1.0,
+]
+# Worker threads applying OCIO processors over row bands, OCIO releases the
+# GIL so the bands run concurrently
+OCIO_THREADS = os.cpu_count() or 1
+OCIO_BAND_MIN_ROWS = 64
+_OCIO_EXECUTOR: ThreadPoolExecutor | None = None
+# Float buffers of ocio_transform, one pool per calling thread. Frames above
+# OCIO_BUFFER_MAX_BYTES get a buffer per call instead of keeping it alive
+OCIO_BUFFER_MAX_BYTES = 256 * 1024 ** 2
+_OCIO_BUFFERS = threading.local()
+_OCIO_BUFFER_POOLS: "weakref.WeakSet[BufferPool]" = weakref.WeakSet()
+# Numba's default (workqueue) threading layer aborts on concurrent calls of
+# parallel kernels, which happens once images are processed off the GUI thread
+_PARALLEL_KERNEL_LOCK = threading.Lock()
+# Kernels are compiled for their signatures at import, cache=True stores the
+# machine code next to the module so only the first start compiles them.
+# Kernel inputs are typed read only so memory mapped images (and their
+# regions) are accepted as well as regular arrays
+_READONLY_UINT8_3D = numba.types.Array(numba.uint8, 3, "A", readonly=True)
+_READONLY_UINT16_3D = numba.types.Array(numba.uint16, 3, "A", readonly=True)
 
 
 def measure_time(func: Callable, *args, **kwargs):
@@ -19,6 +74,69 @@ def measure_time(func: Callable, *args, **kwargs):
     return result
 
 
+def get_nbytes(buffer: np.ndarray | QImage | QPixmap | None) -> int:
+    """
+    Returns the memory used by the pixel data of the buffer.
+
+    """
+    if buffer is None:
+        return 0
+
+    if isinstance(buffer, np.ndarray):
+        return buffer.nbytes
+
+    if isinstance(buffer, QImage):
+        return buffer.sizeInBytes()
+
+    return buffer.width() * buffer.height() * buffer.depth() // 8
+
+
+class MemoryTracker:
+    """
+    Keeps count of the named image buffers alive while loading an image and
+    the peak of their combined size.
+
+    """
+    def __init__(self):
+        self.buffers: dict[str, int] = {}
+        self.peak: int = 0
+
+    def track(self, name: str, buffer: np.ndarray | QImage | QPixmap | None):
+        self.buffers[name] = get_nbytes(buffer)
+        self.peak = max(self.peak, self.current())
+
+    def release(self, name: str):
+        self.buffers.pop(name, None)
+
+    def current(self) -> int:
+        return sum(self.buffers.values())
+
+    def report(self) -> dict:
+        return {
+            "buffers": dict(self.buffers),
+            "current": self.current(),
+            "peak": self.peak,
+        }
+
+
+def decode_image(file_path: str) -> np.ndarray | None:
+    """
+    Decode the image from disk as is. This should be the only disk read per
+    loaded image, every other representation is derived from its result.
+
+    """
+    return cv2.imread(file_path, flags=cv2.IMREAD_UNCHANGED)
+
+
+def decode_image_buffer(buffer: np.ndarray) -> np.ndarray | None:
+    """
+    Decode the image from its encoded file bytes, same flags as
+    decode_image.
+
+    """
+    return cv2.imdecode(buffer, flags=cv2.IMREAD_UNCHANGED)
+
+
 class ChannelEnum:
     RED = 0
     GREEN = 1
@@ -27,128 +145,296 @@ class ChannelEnum:
     LUMINANCE = 100
 
 
-def get_pixmap_from_ndarray(
+def get_image_format(image: np.ndarray, is_mono: bool = False) -> QImage.Format:
+    """
+    Returns the QImage format matching the memory layout of the OpenCV style
+    (BGR/BGRA) image so it can be wrapped without swapping or converting.
+
+    """
+    channel = image.shape[2] if image.ndim > 2 else 1
+
+    if channel == 1 or is_mono:
+        if image.dtype == np.uint16:
+            return QImage.Format.Format_Grayscale16
+
+        return QImage.Format.Format_Grayscale8
+
+    if channel == 3:
+        return QImage.Format.Format_BGR888
+
+    # ARGB32 is stored as B, G, R, A bytes on little endian machines
+    if sys.byteorder == "little":
+        return QImage.Format.Format_ARGB32
+
+    return QImage.Format.Format_RGBA8888
+
+
+def get_qimage_from_ndarray(
         image: np.ndarray,
         is_mono: bool = False,
         image_format: QImage.Format = None,
-) -> QPixmap:
-    if len(image.shape) > 2:
+) -> QImage:
+    """
+    Wrap the image in a QImage without copying the pixels.
+
+    The QImage holds a reference to the array so the buffer stays alive for
+    as long as the QImage does. Only arrays whose pixels aren't packed
+    within a row (e.g. channel reversed views) are copied.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        8-bit BGR(A) or gray image (16-bit gray is supported too)
+    is_mono : bool
+        Only use the first channel as grayscale
+    image_format : QImage.Format | None
+        Override the format, the data must already be laid out in it
+
+    Returns
+    -------
+    QImage
+
+    """
+    if image.ndim > 2:
         height, width, channel = image.shape
     else:
         channel = 1
         height, width = image.shape
 
-    bytes_per_line = channel * width
+    itemsize = image.dtype.itemsize
+    row_packed = image.strides[1] == channel * itemsize and (
+        image.ndim == 2 or image.strides[2] == itemsize
+    )
+    if not row_packed or image.strides[0] < 0:
+        image = np.ascontiguousarray(image)
 
-    # TODO: Hmm need to write a helper to figure out the
-    #  correct image format
-    format_ = QImage.Format.Format_RGBA8888
-    if image_format:
-        format_ = image_format
-    elif is_mono:
-        format_ = QImage.Format.Format_Grayscale8
-    elif channel == 3:
-        format_ = QImage.Format.Format_RGB888
+    format_ = image_format or get_image_format(image, is_mono)
+    if is_mono and channel > 1 and not image_format:
+        image = np.ascontiguousarray(image[..., 0])
 
-    img: QImage = QImage(
-        image.data,
+    data = image
+    if not image.flags.c_contiguous:
+        # Padded rows (e.g. a region of a bigger image), expose the rows span
+        # as a flat buffer since QImage only needs the row stride
+        span = image.strides[0] * (height - 1) + width * channel * itemsize
+        data = np.lib.stride_tricks.as_strided(
+            image.view(np.uint8) if image.ndim == 2 else image.reshape(height, -1).view(np.uint8),
+            shape=(span,),
+            strides=(1,),
+        )
+
+    img = QImage(
+        data.data,
         width,
         height,
-        bytes_per_line,
+        image.strides[0],
         format_,
-    ).rgbSwapped()
+    )
+    if format_ == QImage.Format.Format_RGBA8888 and not image_format and channel == 4:
+        # Big endian machines, no BGRA layout available
+        return img.rgbSwapped()
+
+    img._ndarray = image
+    return img
 
+
+def get_pixmap_from_ndarray(
+        image: np.ndarray,
+        is_mono: bool = False,
+        image_format: QImage.Format = None,
+) -> QPixmap:
+    img = get_qimage_from_ndarray(image, is_mono=is_mono, image_format=image_format)
     return QPixmap.fromImage(img)
 
 
-def get_channel(image: np.ndarray, channel: int) -> np.ndarray:
-    image = image.astype(BitDepth.STD)
-    h, w, channels = image.shape[:3]
+def get_qpolygonf_from_ndarray(points: np.ndarray) -> QPolygonF:
+    """
+    Returns a QPolygonF of the (N, 2) points, copied in bulk into the
+    polygon storage instead of creating a QPointF per point.
+
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    polygon = QPolygonF()
+    polygon.resize(len(points))
+    if not len(points):
+        return polygon
+
+    # data() wraps the first QPointF, i.e. the start of the x, y doubles
+    address = shiboken6.getCppPointer(polygon.data())[0]
+    storage = (ctypes.c_double * points.size).from_address(address)
+    np.copyto(np.ctypeslib.as_array(storage).reshape(-1, 2), points)
+    return polygon
+
+
+def get_ndarray_from_qimage(image: QImage) -> np.ndarray:
+    """
+    View the pixels of the QImage as an ndarray without copying, channels
+    stay in the QImage memory layout (e.g. B, G, R, A for ARGB32).
+
+    The view is only valid while the QImage is alive and left unmodified.
+    16-bit gray images are viewed as uint16, every other format as uint8
+    with one byte per channel.
+
+    """
+    dtype = np.uint16 if image.format() == QImage.Format.Format_Grayscale16 else np.uint8
+    itemsize = np.dtype(dtype).itemsize
+    channel = max(image.depth() // (8 * itemsize), 1)
+    height, width = image.height(), image.width()
+
+    buffer = np.frombuffer(image.constBits(), dtype=np.uint8, count=image.sizeInBytes())
+    rows = buffer.reshape(height, image.bytesPerLine())[:, :width * channel * itemsize]
+    pixels = rows.view(dtype)
+    if channel == 1:
+        return pixels
+
+    return pixels.reshape(height, width, channel)
+
+
+@jit(
+    numba.void(_READONLY_UINT8_3D, numba.int64, numba.uint8[:, :, :]),
+    nopython=True,
+    parallel=True,
+    fastmath=True,
+    cache=True,
+)
+def _get_channel_rgba(
+        image: np.ndarray,
+        channel: int,
+        out: np.ndarray,
+):
+    """
+    Reads the interleaved BGR(A) image once and writes the isolated channel
+    as gray RGBA. Alpha is kept unless the alpha channel itself is isolated.
+
+    """
+    h, w, channels = image.shape
+    has_alpha = channels > 3
+
+    for y in numba.prange(h):
+        for x in range(w):
+            a = image[y, x, 3] if has_alpha else 255
+            if channel == 3:  # ChannelEnum.ALPHA
+                ll = a
+                a = 255
+            else:
+                # BGR(A) order so red is the last color channel
+                ll = image[y, x, 2 - channel]
+
+            out[y, x, 0] = ll
+            out[y, x, 1] = ll
+            out[y, x, 2] = ll
+            out[y, x, 3] = a
+
+
+def get_color_view(image: np.ndarray) -> np.ndarray:
+    """
+    Returns gray (2D) images as a read only 3 channel view repeating the
+    gray value without copying, color images are returned as is.
+
+    """
+    if image.ndim > 2:
+        return image
+
+    return np.broadcast_to(image[..., np.newaxis], (*image.shape, 3))
 
-    has_alpha = False
-    if channels > 3:
-        b, g, r, a = cv2.split(image)
-        has_alpha = True
-    else:
-        b, g, r = cv2.split(image)
-        a = np.ones((h, w), dtype=BitDepth.STD) * 255
 
-    match channel:
-        case ChannelEnum.RED:
-            ll = r
+def _get_rgba_out(image: np.ndarray, out: np.ndarray | None) -> np.ndarray:
+    h, w = image.shape[:2]
+    if out is None:
+        return np.empty((h, w, 4), dtype=BitDepth.STD)
 
-        case ChannelEnum.GREEN:
-            ll = g
+    if out.shape != (h, w, 4) or out.dtype != BitDepth.STD:
+        raise ValueError(f"Expected an uint8 {(h, w, 4)} output buffer, got {out.dtype} {out.shape}")
 
-        case ChannelEnum.BLUE:
-            ll = b
+    return out
 
-        case ChannelEnum.ALPHA:
-            ll = a
-            if has_alpha:
-                a = np.ones((h, w), dtype=BitDepth.STD) * 255
 
-    channel_ = cv2.merge([ll, ll, ll, a])
+def get_channel(image: np.ndarray, channel: int, out: np.ndarray | None = None) -> np.ndarray:
+    image = get_color_view(image)
+    if image.dtype != BitDepth.STD:
+        image = image.astype(BitDepth.STD)
+
+    channel_ = _get_rgba_out(image, out)
+    with _PARALLEL_KERNEL_LOCK:
+        _get_channel_rgba(image, channel, channel_)
 
     return channel_
 
 
 @jit(
-    numba.uint8[:, :](numba.float32[:, :], numba.float32[:, :], numba.float32[:, :]),
+    numba.void(_READONLY_UINT8_3D, numba.uint8[:, :, :]),
     nopython=True,
     parallel=True,
     fastmath=True,
+    cache=True,
 )
 def _get_rec709_luminance(
-        b: np.ndarray,
-        g: np.ndarray,
-        r: np.ndarray,
-) -> np.ndarray:
+        image: np.ndarray,
+        out: np.ndarray,
+):
     # TODO: Maybe consider removing this...
     b_factor = 0.0722 / 255.0 ** 2.2
     g_factor = 0.7152 / 255.0 ** 2.2
     r_factor = 0.2126 / 255.0 ** 2.2
 
-    bb = b ** 2.2 * b_factor
-    gg = g ** 2.2 * g_factor
-    rr = r ** 2.2 * r_factor
+    h, w, channels = image.shape
+    has_alpha = channels > 3
 
-    ll = bb + gg + rr
-    ll = np.power(ll, 1.0 / 2.2) * 255
-    ll = ll.astype(np.uint8)
+    for y in numba.prange(h):
+        for x in range(w):
+            bb = np.float32(image[y, x, 0]) ** 2.2 * b_factor
+            gg = np.float32(image[y, x, 1]) ** 2.2 * g_factor
+            rr = np.float32(image[y, x, 2]) ** 2.2 * r_factor
+            ll = np.uint8(min((bb + gg + rr) ** (1.0 / 2.2) * 255, 255.0))
 
-    return ll
+            out[y, x, 0] = ll
+            out[y, x, 1] = ll
+            out[y, x, 2] = ll
+            out[y, x, 3] = image[y, x, 3] if has_alpha else 255
 
 
 @jit(
-    numba.uint8[:, :](numba.float32[:, :], numba.float32[:, :], numba.float32[:, :]),
+    numba.void(_READONLY_UINT8_3D, numba.uint8[:, :, :]),
     nopython=True,
     parallel=True,
     fastmath=True,
+    cache=True,
 )
 def _get_rec709_luma(
-        b: np.ndarray,
-        g: np.ndarray,
-        r: np.ndarray,
+        image: np.ndarray,
+        out: np.ndarray,
 ):
     """
     Y = 0.2125 R + 0.7154 G + 0.0721 B
     """
-    luma = np.clip((0.2125 * r + 0.7152 * g + 0.0722 * b), 0, 255)
+    h, w, channels = image.shape
+    has_alpha = channels > 3
+
+    for y in numba.prange(h):
+        for x in range(w):
+            luma = (
+                0.2125 * image[y, x, 2]
+                + 0.7152 * image[y, x, 1]
+                + 0.0722 * image[y, x, 0]
+            )
+            ll = np.uint8(min(max(luma, 0.0), 255.0))
 
-    return luma.astype(np.uint8)
+            out[y, x, 0] = ll
+            out[y, x, 1] = ll
+            out[y, x, 2] = ll
+            out[y, x, 3] = image[y, x, 3] if has_alpha else 255
 
 
 @jit(
-    numba.uint8[:, :](numba.uint8[:, :], numba.uint8[:, :], numba.uint8[:, :]),
+    numba.void(_READONLY_UINT8_3D, numba.uint8[:, :, :]),
     nopython=True,
     parallel=True,
     fastmath=True,
+    cache=True,
 )
 def _get_rec709_luma_fast_approx(
-        b: np.ndarray,
-        g: np.ndarray,
-        r: np.ndarray,
+        image: np.ndarray,
+        out: np.ndarray,
 ):
     """
     https://stackoverflow.com/a/596241/8337847
@@ -157,61 +443,186 @@ def _get_rec709_luma_fast_approx(
 
     Y = 0.375 R + 0.5 G + 0.125 B
     """
-    ll = 0.33 * r + 0.5 * g + 0.16 * b
+    h, w, channels = image.shape
+    has_alpha = channels > 3
 
-    return ll.astype(np.uint8)
+    for y in numba.prange(h):
+        for x in range(w):
+            ll = np.uint8(
+                0.33 * image[y, x, 2]
+                + 0.5 * image[y, x, 1]
+                + 0.16 * image[y, x, 0]
+            )
 
+            out[y, x, 0] = ll
+            out[y, x, 1] = ll
+            out[y, x, 2] = ll
+            out[y, x, 3] = image[y, x, 3] if has_alpha else 255
 
-def get_luminance(image: np.ndarray, fast_approx=True) -> np.ndarray:
-    # TODO: Hardcode this flow first and offer as accuracy precision blah blah settings
-    if fast_approx:
-        h, w, channels = image.shape[:3]
-        image = image.astype(np.uint8)
-        if channels == 4:
-            b, g, r, aa = cv2.split(image)
-        else:
-            b, g, r = cv2.split(image)
-            aa: np.ndarray = np.ones((h, w), dtype=np.uint8) * 255
 
-        # TODO: Average ~0.11 secs on 4000x3000 px image on i5 13th gen...
-        ll = _get_rec709_luma_fast_approx(b, g, r)
-        img = cv2.merge([ll, ll, ll, aa])
+def get_luminance(
+        image: np.ndarray,
+        fast_approx=True,
+        exact=False,
+        out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Returns the luma (or luminance when exact) of the image as gray RGBA.
 
-        return img
+    Parameters
+    ----------
+    image : np.ndarray
+        BGR(A) or gray image
+    fast_approx : bool
+        Use the fast luma approximation
+    exact : bool
+        Compute the Rec.709 luminance on linearized values. Slowest
+    out : np.ndarray | None
+        Preallocated (H, W, 4) uint8 output buffer
 
-    h, w, channels = image.shape[:3]
+    Returns
+    -------
+    np.ndarray
+        8-bit RGBA image
 
-    aa: np.ndarray = np.ones((h, w), dtype=np.uint8) * 255
-    if channels == 4:
-        b, g, r, aa = cv2.split(image)
-        aa = aa.astype(BitDepth.STD)
-    else:
-        b, g, r = cv2.split(image)
+    """
+    image = get_color_view(image)
+    if image.dtype != BitDepth.STD:
+        image = image.astype(BitDepth.STD)
 
-    r: np.ndarray
-    g: np.ndarray
-    b: np.ndarray
-    a: np.ndarray
+    img = _get_rgba_out(image, out)
+    if exact:
+        kernel = _get_rec709_luminance
+    elif fast_approx:
+        kernel = _get_rec709_luma_fast_approx
+    else:
+        kernel = _get_rec709_luma
 
-    # TODO: Average ~0.25 secs on 4000x3000 px image on i5 13th gen...
-    # ll = _get_rec709_luminance(b, g, r)
-    # TODO: Average ~0.17 secs on 4000x3000 px image on i5 13th gen...
-    ll = _get_rec709_luma(b, g, r)
-    img = cv2.merge([ll, ll, ll, aa])
+    with _PARALLEL_KERNEL_LOCK:
+        kernel(image, img)
 
     return img
 
 
-def adjust_gamma(image: np.ndarray, gamma: float = 1.0):
-    img: np.ndarray = np.power(image, 1.0 / gamma)
-    img = img.astype(np.float32)
-    return img
+def _get_lut_domain(depth: np.dtype) -> np.ndarray:
+    """
+    Returns every code value of the bit depth, normalized to 0-1 for integer
+    depths. Half-float codes are the float16 values of every bit pattern.
 
+    """
+    depth = np.dtype(depth)
+    if depth == BitDepth.HALF:
+        return np.arange(65536, dtype=np.uint16).view(BitDepth.HALF).astype(BitDepth.FLOAT)
 
-def get_invert_color(image: np.ndarray) -> np.ndarray:
-    img = image.astype(BitDepth.STD)
-    img = cv2.bitwise_not(img)
-    return img
+    max_value = np.iinfo(depth).max
+    return np.arange(max_value + 1, dtype=np.float64) / max_value
+
+
+def get_lut(
+        name: str,
+        func: Callable[[np.ndarray], np.ndarray],
+        depth: np.dtype = BitDepth.STD,
+        *params,
+) -> np.ndarray:
+    """
+    Returns the table of func evaluated over every code value of the bit
+    depth, built once per (name, params, depth).
+
+    Integer depths (256 or 65536 entries) get normalized 0-1 inputs and the
+    result is truncated back to the same depth. Half-float tables are
+    indexed by the uint16 bit pattern and hold float32 values.
+
+    """
+    depth = np.dtype(depth)
+    key = (name, params, depth.str)
+    return LUT_REGISTRY.get_or_create(key, lambda: _build_lut(func, depth))
+
+
+def _build_lut(func: Callable[[np.ndarray], np.ndarray], depth: np.dtype) -> np.ndarray:
+    with np.errstate(invalid="ignore", over="ignore"):
+        values = func(_get_lut_domain(depth))
+
+    if depth == BitDepth.HALF:
+        return np.nan_to_num(values).astype(BitDepth.FLOAT)
+
+    max_value = np.iinfo(depth).max
+    return np.clip(values * max_value, 0, max_value).astype(depth)
+
+
+def get_gamma_lut(gamma: float, depth: np.dtype = BitDepth.STD) -> np.ndarray:
+    """
+    Returns the cached x ** gamma table for the bit depth.
+
+    """
+    return get_lut(
+        "gamma",
+        lambda x: np.power(np.maximum(x, 0.0), gamma),
+        depth,
+        gamma,
+    )
+
+
+def apply_lut(image: np.ndarray, lut: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Apply a table from get_lut in a single pass. uint8 images go through
+    cv2.LUT, uint16 and half-float images through a gather. float32 images
+    are looked up through their half-float value.
+
+    """
+    if image.dtype == BitDepth.STD:
+        return cv2.LUT(image, lut, dst=out)
+
+    if image.dtype == BitDepth.FLOAT:
+        image = image.astype(BitDepth.HALF)
+
+    if image.dtype == BitDepth.HALF:
+        image = image.view(np.uint16)
+
+    return np.take(lut, image, out=out)
+
+
+def adjust_gamma(image: np.ndarray, gamma: float = 1.0, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Apply the 1 / gamma power through a cached LUT. Integer images are
+    adjusted on their normalized values and keep their dtype, float images
+    are adjusted on their values as is and return float32.
+
+    """
+    depth = BitDepth.HALF if image.dtype.kind == "f" else image.dtype
+    lut = get_gamma_lut(1.0 / gamma, depth)
+    return apply_lut(image, lut, out=out)
+
+
+def get_color_lut(table: np.ndarray, channels: int) -> np.ndarray:
+    """
+    Returns the 8-bit table as a cv2.LUT table for images of the given
+    number of channels, the 4th (alpha) channel is left untouched.
+
+    """
+    if channels == 1:
+        return table.reshape(1, 256)
+
+    tables = [table] * min(channels, 3)
+    if channels == 4:
+        tables.append(np.arange(256, dtype=BitDepth.STD))
+
+    return np.dstack(tables)
+
+
+def get_invert_color(image: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Invert the color channels of the image, alpha is kept as is.
+
+    """
+    img = image.astype(BitDepth.STD, copy=False)
+    if img.ndim < 3 or img.shape[2] < 4:
+        return cv2.bitwise_not(img, dst=out)
+
+    def _build() -> np.ndarray:
+        return get_color_lut(255 - np.arange(256, dtype=BitDepth.STD), 4)
+
+    lut = LUT_REGISTRY.get_or_create(("invert", (4,), np.dtype(BitDepth.STD).str), _build)
+    return cv2.LUT(img, lut, dst=out)
 
 
 # TODO: Consider removing this in the future... for now leave it be as
@@ -224,66 +635,680 @@ def _get_invert_linear_color(image: np.ndarray) -> np.ndarray:
     return img
 
 
-def get_invert_linear_color(image: np.ndarray) -> np.ndarray:
-    img = image.astype(BitDepth.STD)
-    inv_gamma = 1.0 / 2.2
-    inv_table = np.array(
-        [
-            ((i / 255.0) ** inv_gamma) * 255
-            for i in np.arange(0, 256)
-        ]
-    ).astype(BitDepth.STD)
-
-    gamma = 2.2
-    table = np.array(
-        [
-            ((i / 255.0) ** gamma) * 255
-            for i in np.arange(0, 256)
-        ]
-    ).astype(BitDepth.STD)
-
-    # apply gamma correction using the lookup table
-    img = cv2.LUT(img, table)
-    img = cv2.bitwise_not(img)
-    img = cv2.LUT(img, inv_table)
-    return img
+def get_invert_linear_lut(gamma: float = 2.2) -> np.ndarray:
+    """
+    Returns the 8-bit table removing the gamma, inverting and applying the
+    gamma back, composed from the cached gamma tables.
+
+    """
+    def _build() -> np.ndarray:
+        table = get_gamma_lut(gamma)
+        inv_table = get_gamma_lut(1.0 / gamma)
+        return inv_table[255 - table]
+
+    key = ("invert_linear", (gamma,), np.dtype(BitDepth.STD).str)
+    return LUT_REGISTRY.get_or_create(key, _build)
+
+
+def get_invert_linear_color(image: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Invert the color channels of the image with the gamma removed, alpha is
+    kept as is.
+
+    """
+    img = image.astype(BitDepth.STD, copy=False)
+    channels = 1 if img.ndim == 2 else img.shape[2]
+    return cv2.LUT(img, get_color_lut(get_invert_linear_lut(), channels), dst=out)
+
+
+def get_adjust_lut(
+        brightness: float = 0.0,
+        contrast: float = 0.0,
+        exposure: float = 0.0,
+        gamma: float = 1.0,
+        channels: int = 1,
+) -> np.ndarray:
+    """
+    Returns the 8-bit table combining every tone adjustment, applied in the
+    order exposure, contrast, brightness and gamma.
+
+    Parameters
+    ----------
+    brightness : float
+        Offset added to the normalized values
+    contrast : float
+        Contrast around mid gray, -1 (flat) to 1 (doubled)
+    exposure : float
+        Exposure in stops
+    gamma : float
+        Display gamma, values get the 1 / gamma power
+    channels : int
+        Number of channels of the images the table is applied to. The
+        4th (alpha) channel is left untouched.
+
+    Returns
+    -------
+    np.ndarray
+        (1, 256, channels) table for cv2.LUT
+
+    """
+    params = (brightness, contrast, exposure, gamma)
+
+    def _adjust(x: np.ndarray) -> np.ndarray:
+        x = x * 2.0 ** exposure
+        x = (x - 0.5) * (1.0 + contrast) + 0.5 + brightness
+        x = np.power(np.clip(x, 0.0, 1.0), 1.0 / gamma)
+        # Round to the nearest code so the identity adjustment is lossless
+        return np.rint(x * 255.0) / 255.0
+
+    def _build() -> np.ndarray:
+        table = _build_lut(_adjust, np.dtype(BitDepth.STD))
+        return get_color_lut(table, channels)
+
+    return ADJUST_LUT_CACHE.get_or_create((*params, channels), _build)
+
+
+def adjust_image(
+        image: np.ndarray,
+        brightness: float = 0.0,
+        contrast: float = 0.0,
+        exposure: float = 0.0,
+        gamma: float = 1.0,
+        out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Apply the tone adjustments to an 8-bit image in a single cv2.LUT pass,
+    only the table gets recomputed when the adjustments change.
+
+    """
+    channels = 1 if image.ndim == 2 else image.shape[2]
+    lut = get_adjust_lut(brightness, contrast, exposure, gamma, channels)
+    return cv2.LUT(image, lut, dst=out)
+
+
+def get_ocio_processor(
+        display: str | None = None,
+        view: str | None = None,
+        src: str = OCIO.ROLE_SCENE_LINEAR,
+        config: OCIO.Config | None = None,
+        bit_depth: OCIO.BitDepth = OCIO.BIT_DEPTH_F32,
+        bgr: bool = True,
+) -> OCIO.CPUProcessor:
+    """
+    Returns the CPU processor for the display/view transform, building it only
+    once per (config, src, display, view, bit_depth, bgr) combination.
+
+    The processor reads and writes pixels of the given bit depth, integer
+    values are normalized by OCIO itself. With bgr, the red and blue
+    channels are swapped around the transform so OpenCV BGR(A) pixels can
+    be processed as is.
+
+    """
+    if config is None:
+        config = get_ocio_config()
+
+    if not display:
+        display = config.getDefaultDisplay()
+
+    if not view:
+        view = config.getDefaultView(display)
+
+    def _build_processor() -> OCIO.CPUProcessor:
+        transform = OCIO.DisplayViewTransform()
+        transform.setSrc(src)
+        transform.setDisplay(display)
+        transform.setView(view)
+
+        if bgr:
+            transform = OCIO.GroupTransform([
+                OCIO.MatrixTransform(_OCIO_SWAP_RB),
+                transform,
+                OCIO.MatrixTransform(_OCIO_SWAP_RB),
+            ])
+
+        processor: OCIO.Processor = config.getProcessor(transform)
+        if bit_depth == OCIO.BIT_DEPTH_F32:
+            return processor.getDefaultCPUProcessor()
+
+        return processor.getOptimizedCPUProcessor(
+            bit_depth,
+            bit_depth,
+            OCIO.OPTIMIZATION_DEFAULT,
+        )
+
+    key = (config.getCacheID(), src, display, view, bit_depth, bgr)
+    return OCIO_PROCESSOR_CACHE.get_or_create(key, _build_processor)
+
+
+def get_ocio_dtype(dtype: np.dtype) -> np.dtype:
+    """
+    Returns the dtype ocio_transform processes images of the given dtype
+    at, its processor bit depth is OCIO_BIT_DEPTHS of it. Floats of other
+    precisions are processed as float32, other integers aren't supported
+    since OCIO would read them unnormalized.
+
+    """
+    dtype = np.dtype(dtype)
+    if dtype in OCIO_BIT_DEPTHS:
+        return dtype
+
+    if dtype.kind != "f":
+        raise ValueError(f"Unsupported {dtype} image, convert it with BitDepth.to_supported")
+
+    return np.dtype(BitDepth.FLOAT)
 
 
 def ocio_transform(
         image: np.ndarray,
         view: str | None = None,
         display: str | None = None,
+        lut_size: int | None = None,
+        out: np.ndarray | None = None,
+        threads: int | None = None,
+        scale: float = 1.0 / 255.0,
+        config: OCIO.Config | None = None,
+        hdr: bool | None = None,
 ) -> np.ndarray:
+    """
+    Apply the OCIO display/view transform to the image.
+
+    uint8, uint16, float16 and float32 images are fed to a processor of the
+    matching bit depth, so integer images need no float conversion and
+    half-float images stay half-float. The image is split in row bands
+    transformed concurrently in place in a buffer reused across calls. Gray
+    images are transformed as BGR and return a 3 channel image.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        Image of one of the OCIO_BIT_DEPTHS dtypes or float image, see scale
+    view : str | None
+        OCIO view, defaults to the config default view
+    display : str | None
+        OCIO display, defaults to the config default display
+    lut_size : int | None
+        If specified, approximate the transform with a baked 3D LUT of this
+        size (e.g. 33 or 65) instead of running the full CPU processor.
+        Float images use a LUT baked over the HDR domain, see bake_ocio_lut
+    out : np.ndarray | None
+        Preallocated uint8 output buffer of the same shape as the (BGR)
+        image
+    threads : int | None
+        Number of row bands, defaults to OCIO_THREADS
+    scale : float
+        Factor bringing float values to the OCIO 0-1 range, the default
+        matches float images in the 0-255 range. Ignored for integer images.
+    config : OCIO.Config | None
+        Defaults to the session config
+    hdr : bool | None
+        Bake the LUT over the HDR domain, defaults to float images only.
+        Ignored without lut_size.
+
+    Returns
+    -------
+    np.ndarray
+        8-bit display image
+
+    """
+    image = get_color_view(image)
+    dtype = get_ocio_dtype(image.dtype)
+    if lut_size:
+        # Float images may hold scene linear values above 1.0
+        if hdr is None:
+            hdr = image.dtype.kind == "f"
+        lut = bake_ocio_lut(display=display, view=view, size=lut_size, config=config, hdr=hdr)
+        if image.dtype.kind == "f":
+            lut_scale = 1.0 / scale
+        else:
+            lut_scale = float(np.iinfo(image.dtype).max)
+
+        return apply_lut3d(image, lut, scale=lut_scale, out=out, hdr=hdr)
+
     # TODO: This will get complicated real quick but consider digesting this code 
     #  to figure out a way to implement OpenGL LUT from here: 
     #  https://github.com/AcademySoftwareFoundation/OpenColorIO/tree/main/src/apps/pyociodisplay
 
-    config = OCIO_CONFIG
+    # TODO: Implement optional roles for setSrc?
+    # FIXME: Another hardcode for src color space. Maybe leaving it linear works??
+    cpu = get_ocio_processor(
+        display=display,
+        view=view,
+        config=config,
+        bit_depth=OCIO_BIT_DEPTHS[dtype],
+    )
 
-    if display is None:
-        display = config.getDefaultDisplay()
+    # TODO: Currently average 0.2-0.4 secs on Intel i5 13th Gen CPU... which is very slow
+    if out is None:
+        out = np.empty(image.shape, dtype=BitDepth.STD)
 
-    if view is None:
-        view = config.getDefaultView(display)
+    # 8-bit images are transformed straight in the output buffer, other
+    # depths in a buffer of their own dtype
+    img = out if dtype == BitDepth.STD else _get_ocio_buffer(image.shape, dtype)
+    if dtype.kind != "f" or scale == 1.0:
+        scale = None
 
-    # TODO: Implement optional roles for setSrc?
-    # FIXME: Another hardcode for src color space. Maybe leaving it linear works??
-    transform = OCIO.DisplayViewTransform()
-    transform.setSrc(OCIO.ROLE_SCENE_LINEAR)
-    transform.setDisplay(display)
-    transform.setView(view)
+    # Alpha is passed through by OCIO
+    apply = cpu.applyRGBA if image.shape[2] == 4 else cpu.applyRGB
 
-    processor: OCIO.Processor = config.getProcessor(transform)
-    cpu = processor.getDefaultCPUProcessor()
+    def _transform_band(start: int, stop: int):
+        band = img[start:stop]
+        if scale is None:
+            np.copyto(band, image[start:stop], casting="unsafe")
+        else:
+            np.multiply(image[start:stop], scale, out=band, casting="unsafe")
 
-    # TODO: Currently average 0.2-0.4 secs on Intel i5 13th Gen CPU... which is very slow
-    image = image.astype(BitDepth.FLOAT)
-    img = image / 255.0
+        apply(band)
+        if dtype == BitDepth.STD:
+            return
 
-    # FIXME: For whatever reason, inverted image alpha is gray instead of white...
-    cpu.applyRGB(img)
+        if dtype == np.uint16:
+            np.right_shift(band, 8, out=out[start:stop], casting="unsafe")
+            return
 
-    # Potential out of range values after applyRGB so better clamp I mean clip the values
-    # before displaying to the viewer 
-    img = np.clip(img * 255.0, 0, 255).astype(BitDepth.STD)
-    return img
+        # Potential out of range values after apply so scale, clip and
+        # quantize in a single pass
+        quantize_float(band, out=out[start:stop])
+
+    bands = _get_row_bands(image.shape[0], threads or OCIO_THREADS)
+    if len(bands) == 1:
+        _transform_band(*bands[0])
+        return out
+
+    futures = [_get_ocio_executor().submit(_transform_band, *band) for band in bands]
+    for future in futures:
+        future.result()
+
+    return out
+
+
+def _get_half_quantize_lut() -> np.ndarray:
+    def _build() -> np.ndarray:
+        values = np.nan_to_num(_get_lut_domain(BitDepth.HALF))
+        with np.errstate(over="ignore"):
+            return np.clip(values * 255.0, 0, 255).astype(BitDepth.STD)
+
+    key = ("quantize", (), np.dtype(BitDepth.HALF).str)
+    return LUT_REGISTRY.get_or_create(key, _build)
+
+
+@jit(
+    numba.void(numba.float32[:, :], numba.uint8[:, :]),
+    nopython=True,
+    fastmath=True,
+    cache=True,
+)
+def _quantize_float32(image: np.ndarray, out: np.ndarray):
+    # Not parallel, callers already split the image in bands across threads
+    h, w = image.shape
+    for y in range(h):
+        for x in range(w):
+            v = image[y, x] * 255.0
+            if v < 0.0 or v != v:
+                v = 0.0
+            elif v > 255.0:
+                v = 255.0
+            out[y, x] = np.uint8(v)
+
+
+def quantize_float(image: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Scale a 0-1 float image to 0-255, clip and quantize to 8-bit in a
+    single pass. Half-float images go through a table indexed by their bit
+    pattern.
+
+    """
+    if out is None:
+        out = np.empty(image.shape, dtype=BitDepth.STD)
+
+    if image.dtype == BitDepth.HALF:
+        return np.take(_get_half_quantize_lut(), image.view(np.uint16), out=out)
+
+    image = np.ascontiguousarray(image, dtype=BitDepth.FLOAT)
+    h = image.shape[0]
+    if out.flags.c_contiguous:
+        _quantize_float32(image.reshape(h, -1), out.reshape(h, -1))
+        return out
+
+    flat = np.empty(image.shape, dtype=BitDepth.STD)
+    _quantize_float32(image.reshape(h, -1), flat.reshape(h, -1))
+    np.copyto(out, flat)
+    return out
+
+
+def set_ocio_threads(count: int):
+    """
+    Set the number of threads applying OCIO processors.
+
+    """
+    global OCIO_THREADS, _OCIO_EXECUTOR
+    OCIO_THREADS = max(int(count), 1)
+    if _OCIO_EXECUTOR is not None:
+        _OCIO_EXECUTOR.shutdown(wait=False)
+        _OCIO_EXECUTOR = None
+
+
+def _get_ocio_executor() -> ThreadPoolExecutor:
+    global _OCIO_EXECUTOR
+    if _OCIO_EXECUTOR is None:
+        _OCIO_EXECUTOR = ThreadPoolExecutor(
+            max_workers=OCIO_THREADS,
+            thread_name_prefix="nande-ocio",
+        )
+
+    return _OCIO_EXECUTOR
+
+
+def _get_ocio_buffer(shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    if np.prod(shape) * dtype.itemsize > OCIO_BUFFER_MAX_BYTES:
+        return np.empty(shape, dtype=dtype)
+
+    pool = getattr(_OCIO_BUFFERS, "pool", None)
+    if pool is None:
+        pool = _OCIO_BUFFERS.pool = BufferPool()
+        _OCIO_BUFFER_POOLS.add(pool)
+
+    return pool.get(dtype.str, shape, dtype)
+
+
+def clear_ocio_buffers():
+    """
+    Release the buffers ocio_transform keeps for every calling thread, to be
+    called once they are no longer needed (e.g. the image changed).
+
+    """
+    for pool in list(_OCIO_BUFFER_POOLS):
+        pool.clear()
+
+
+def get_ocio_buffers_info() -> dict:
+    return {
+        "pools": len(_OCIO_BUFFER_POOLS),
+        "nbytes": sum(pool.nbytes for pool in list(_OCIO_BUFFER_POOLS)),
+    }
+
+
+def _get_row_bands(height: int, count: int) -> list[tuple[int, int]]:
+    """
+    Split the rows in at most count bands of at least OCIO_BAND_MIN_ROWS.
+
+    """
+    count = max(min(count, height // OCIO_BAND_MIN_ROWS), 1)
+    edges = np.linspace(0, height, count + 1).astype(int)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def get_lut_domain_values(coords: np.ndarray, hdr: bool = False) -> np.ndarray:
+    """
+    Returns the input values of normalized (0-1) baked LUT coordinates.
+
+    """
+    if hdr:
+        low, high = OCIO_LUT_HDR_STOPS
+        return np.exp2(low + coords * (high - low))
+
+    return coords ** OCIO_LUT_SHAPER
+
+
+def get_lut_domain_coords(values: np.ndarray, hdr: bool = False) -> np.ndarray:
+    """
+    Returns the normalized (0-1) baked LUT coordinates of input values,
+    values outside of the domain are clamped to its edges.
+
+    """
+    if hdr:
+        low, high = OCIO_LUT_HDR_STOPS
+        values = np.clip(values, 2.0 ** low, 2.0 ** high)
+        return (np.log2(values) - low) / (high - low)
+
+    return np.clip(values, 0.0, 1.0) ** (1.0 / OCIO_LUT_SHAPER)
+
+
+def bake_ocio_lut(
+        display: str | None = None,
+        view: str | None = None,
+        size: int = 33,
+        config: OCIO.Config | None = None,
+        hdr: bool = False,
+) -> np.ndarray:
+    """
+    Bake the display/view transform into a 3D LUT.
+
+    The default domain is 0-1 (sampled through OCIO_LUT_SHAPER), which
+    covers integer images but clips scene linear values above 1.0. With
+    hdr, the domain spans OCIO_LUT_HDR_STOPS on a log2 grid so float images
+    keep their highlight rolloff. Values outside the domain still clamp to
+    its edges, use the exact processor when they matter.
+
+    Returns
+    -------
+    np.ndarray
+        float32 LUT of shape (size, size, size, 3), indexed in the same
+        channel order as the image it will be applied to
+
+    """
+    cpu = get_ocio_processor(display=display, view=view, config=config)
+
+    def _bake() -> np.ndarray:
+        coords = np.linspace(0.0, 1.0, size, dtype=np.float32)
+        domain = get_lut_domain_values(coords, hdr).astype(np.float32)
+        grid = np.stack(
+            np.meshgrid(domain, domain, domain, indexing="ij"),
+            axis=-1,
+        )
+        grid = np.ascontiguousarray(grid.reshape(-1, 3))
+        cpu.applyRGB(grid)
+        return grid.reshape(size, size, size, 3)
+
+    key = (cpu.getCacheID(), size, hdr)
+    return OCIO_LUT_CACHE.get_or_create(key, _bake)
+
+
+def _get_lut3d_coords(dtype: np.dtype, size: int, scale: float, hdr: bool = False) -> np.ndarray:
+    """
+    Table mapping every possible input code value to its (clamped) LUT
+    coordinate. uint8 images are indexed directly and half-float images
+    through their uint16 bit pattern.
+
+    """
+    def _build() -> np.ndarray:
+        if dtype == np.uint8:
+            values = np.arange(256, dtype=np.float32)
+        else:
+            values = np.arange(65536, dtype=np.uint16).view(np.float16)
+            values = np.nan_to_num(values.astype(np.float32), nan=0.0)
+
+        coords = get_lut_domain_coords(values / scale, hdr) * (size - 1)
+        return coords.astype(np.float32)
+
+    key = ("coords", np.dtype(dtype).str, size, scale, hdr)
+    return OCIO_LUT_CACHE.get_or_create(key, _build)
+
+
+@jit(
+    [
+        numba.void(
+            _READONLY_UINT8_3D,
+            numba.float32[:],
+            numba.float32[:, :, :, :],
+            numba.uint8[:, :, :],
+        ),
+        # Half-float images, indexed by their bit pattern
+        numba.void(
+            _READONLY_UINT16_3D,
+            numba.float32[:],
+            numba.float32[:, :, :, :],
+            numba.uint8[:, :, :],
+        ),
+    ],
+    nopython=True,
+    parallel=True,
+    fastmath=True,
+    cache=True,
+)
+def _apply_lut3d_tetrahedral(image, coords, lut, out):
+    h, w = image.shape[:2]
+    n = lut.shape[0] - 1
+
+    for y in numba.prange(h):
+        for x in range(w):
+            fa = coords[image[y, x, 0]]
+            fb = coords[image[y, x, 1]]
+            fc = coords[image[y, x, 2]]
+
+            a0 = min(int(fa), n - 1)
+            b0 = min(int(fb), n - 1)
+            c0 = min(int(fc), n - 1)
+            fa -= a0
+            fb -= b0
+            fc -= c0
+
+            for ch in range(3):
+                c000 = lut[a0, b0, c0, ch]
+                c111 = lut[a0 + 1, b0 + 1, c0 + 1, ch]
+                if fa > fb:
+                    if fb > fc:
+                        v = (
+                            (1 - fa) * c000
+                            + (fa - fb) * lut[a0 + 1, b0, c0, ch]
+                            + (fb - fc) * lut[a0 + 1, b0 + 1, c0, ch]
+                            + fc * c111
+                        )
+                    elif fa > fc:
+                        v = (
+                            (1 - fa) * c000
+                            + (fa - fc) * lut[a0 + 1, b0, c0, ch]
+                            + (fc - fb) * lut[a0 + 1, b0, c0 + 1, ch]
+                            + fb * c111
+                        )
+                    else:
+                        v = (
+                            (1 - fc) * c000
+                            + (fc - fa) * lut[a0, b0, c0 + 1, ch]
+                            + (fa - fb) * lut[a0 + 1, b0, c0 + 1, ch]
+                            + fb * c111
+                        )
+                else:
+                    if fc > fb:
+                        v = (
+                            (1 - fc) * c000
+                            + (fc - fb) * lut[a0, b0, c0 + 1, ch]
+                            + (fb - fa) * lut[a0, b0 + 1, c0 + 1, ch]
+                            + fa * c111
+                        )
+                    elif fc > fa:
+                        v = (
+                            (1 - fb) * c000
+                            + (fb - fc) * lut[a0, b0 + 1, c0, ch]
+                            + (fc - fa) * lut[a0, b0 + 1, c0 + 1, ch]
+                            + fa * c111
+                        )
+                    else:
+                        v = (
+                            (1 - fb) * c000
+                            + (fb - fa) * lut[a0, b0 + 1, c0, ch]
+                            + (fa - fc) * lut[a0 + 1, b0 + 1, c0, ch]
+                            + fc * c111
+                        )
+
+                out[y, x, ch] = np.uint8(min(max(v * 255.0 + 0.5, 0.0), 255.0))
+
+
+def apply_lut3d(
+        image: np.ndarray,
+        lut: np.ndarray,
+        scale: float = 255.0,
+        out: np.ndarray | None = None,
+        hdr: bool = False,
+) -> np.ndarray:
+    """
+    Apply a baked 3D LUT with tetrahedral interpolation.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        uint8 or float image with 3 or 4 channels. Float images are
+        quantized to half-float before the lookup
+    lut : np.ndarray
+        LUT from bake_ocio_lut
+    scale : float
+        Input value mapped to the top of the LUT domain
+    out : np.ndarray | None
+        Preallocated uint8 output buffer of the same shape as the image
+    hdr : bool
+        The LUT was baked over the HDR domain, only for float images
+
+    Returns
+    -------
+    np.ndarray
+        8-bit image with the same channel count as the input
+
+    """
+    if image.dtype == BitDepth.STD:
+        codes = image
+        coords = _get_lut3d_coords(BitDepth.STD, lut.shape[0], scale)
+    else:
+        # Values above the half-float range become inf and clamp to the LUT edge
+        with np.errstate(over="ignore"):
+            codes = image.astype(BitDepth.HALF, copy=False).view(np.uint16)
+        coords = _get_lut3d_coords(BitDepth.HALF, lut.shape[0], scale, hdr)
+
+    if out is None:
+        out = np.empty(image.shape, dtype=BitDepth.STD)
+
+    with _PARALLEL_KERNEL_LOCK:
+        _apply_lut3d_tetrahedral(codes, coords, lut, out)
+
+    if image.shape[2] > 3:
+        alpha = image[..., 3] * (255.0 / scale)
+        out[..., 3] = np.clip(alpha, 0, 255)
+
+    return out
+
+
+def check_ocio_lut_accuracy(
+        image: np.ndarray,
+        display: str | None = None,
+        view: str | None = None,
+        size: int = 33,
+        scale: float = 1.0,
+        hdr: bool | None = None,
+) -> dict:
+    """
+    Compare the baked LUT path against the exact CPU processor path.
+
+    The scale and hdr defaults match the ones of the viewer graph, float
+    images are in the 0-1 range and get a LUT baked over the HDR domain.
+    See ocio_transform.
+
+    Returns
+    -------
+    dict
+        Max/mean absolute error in 8-bit code values and the timings of
+        both paths
+
+    """
+    image = image[..., :3]
+
+    start_time = time.perf_counter()
+    exact = ocio_transform(image, view=view, display=display, scale=scale)
+    exact_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    approx = ocio_transform(
+        image,
+        view=view,
+        display=display,
+        lut_size=size,
+        scale=scale,
+        hdr=hdr,
+    )
+    lut_time = time.perf_counter() - start_time
+
+    error = cv2.absdiff(exact, approx)
+    return {
+        "lut_size": size,
+        "max_error": int(error.max()),
+        "mean_error": float(error.mean()),
+        "exact_secs": exact_time,
+        "lut_secs": lut_time,
+    }
@@ -1,27 +1,52 @@
 from __future__ import annotations
 
+import math
 import os
 from functools import partial
+from typing import Callable
 
 import cv2
 import numpy
 import numpy as np
+import PyOpenColorIO as OCIO
 import qimage2ndarray
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtOpenGLWidgets import QOpenGLWidget
 from PySide6.QtWidgets import *
 
-from nande import BIT_DEPTH, BitDepth, OCIO_CONFIG
+from nande import BitDepth, get_builtin_ocio_configs, get_ocio_config
+from nande.cache import LRUCache
+from nande.graph import (
+    ADJUST_NONE,
+    INVERT_COLOR,
+    INVERT_LINEAR_COLOR,
+    INVERT_NONE,
+    ImageGraph,
+)
+from nande.gl import GL_LUT_SIZE, GLImageRenderer, is_gl_available
+from nande.loaders import open_memmap, open_raw
+from nande.tiles import MIP_MIN_SIZE, TILE_CACHE_MAX_BYTES, TilePyramid, get_mip_level
 from nande.utils import (
+    OCIO_BIT_DEPTHS,
     ChannelEnum,
-    get_channel,
-    get_invert_color,
-    get_invert_linear_color,
-    get_luminance,
+    MemoryTracker,
+    bake_ocio_lut,
+    clear_ocio_buffers,
+    decode_image,
+    get_nbytes,
+    get_ocio_dtype,
+    get_ocio_processor,
     get_pixmap_from_ndarray,
+    get_qimage_from_ndarray,
+    get_qpolygonf_from_ndarray,
     measure_time,
-    ocio_transform,
+)
+from nande.workers import (
+    LOAD_PROGRESS_BUSY,
+    ImageLoadWorker,
+    ImageProcessWorker,
+    MipBuildWorker,
 )
 
 VALID_FORMATS = (
@@ -35,10 +60,46 @@ VALID_FORMATS = (
     ".ico",
     ".bmp",
     ".webp",
+    ".npy",
 )
 ZOOM_MIN = -0.95
 ZOOM_MAX = 2.0
 
+PROFILE_QUALITY = "quality"
+PROFILE_PERFORMANCE = "performance"
+# (cache mode, viewport update mode, optimization flags) of the viewer
+VIEW_PROFILES = {
+    # Qt defaults, everything is redrawn from scratch
+    PROFILE_QUALITY: (
+        QGraphicsView.CacheModeFlag.CacheNone,
+        QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate,
+        QGraphicsView.OptimizationFlag(0),
+    ),
+    # The grid and background are rendered once per zoom into a pixmap which
+    # is scrolled while panning, painter states aren't saved per item
+    PROFILE_PERFORMANCE: (
+        QGraphicsView.CacheModeFlag.CacheBackground,
+        QGraphicsView.ViewportUpdateMode.SmartViewportUpdate,
+        QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing
+        | QGraphicsView.OptimizationFlag.DontSavePainterState,
+    ),
+}
+
+
+class OCIOConfigsComboBox(QComboBox):
+    def __init__(self, parent: NandeViewToolbar):
+        super().__init__(parent)
+        self.parent_ = parent
+        try:
+            self.populate()
+        except Exception as e:
+            print(f"Woops unhandled exception! {e}")
+
+    def populate(self):
+        self.addItem("Default ($OCIO)", None)
+        for uri, name in get_builtin_ocio_configs().items():
+            self.addItem(name, uri)
+
 
 class OCIOViewsComboBox(QComboBox):
     def __init__(self, parent: NandeViewToolbar):
@@ -49,16 +110,19 @@ class OCIOViewsComboBox(QComboBox):
         except Exception as e:
             print(f"Woops unhandled exception! {e}")
 
-    def populate(self):
-        config = OCIO_CONFIG
-        default_display = config.getDefaultDisplay()
-        default_view = config.getDefaultView(default_display)
-        views = config.getActiveViews().split(",")
-        for view in views:
-            self.addItem(view.strip())
+    def populate(self, display: str | None = None):
+        config = self.parent_.parent_.get_ocio_config()
+        display = display or config.getDefaultDisplay()
+        default_view = config.getDefaultView(display)
+
+        self.blockSignals(True)
+        self.clear()
+        for view in config.getViews(display):
+            self.addItem(view)
 
         dv_idx: int = self.findText(default_view)
         self.setCurrentIndex(dv_idx)
+        self.blockSignals(False)
 
 
 class OCIODisplaysComboBox(QComboBox):
@@ -71,15 +135,18 @@ class OCIODisplaysComboBox(QComboBox):
             print(f"Woops unhandled exception! {e}")
 
     def populate(self):
-        config = OCIO_CONFIG
-        displays = config.getDisplays()
+        config = self.parent_.parent_.get_ocio_config()
         default_display = config.getDefaultDisplay()
-        for display in displays:
+
+        self.blockSignals(True)
+        self.clear()
+        for display in config.getDisplays():
             display: str
             self.addItem(display)
 
         dd_idx: int = self.findText(default_display)
         self.setCurrentIndex(dd_idx)
+        self.blockSignals(False)
 
 
 class NandeButton(QPushButton):
@@ -124,6 +191,15 @@ class NandeImageAdjustmentToolbar(QWidget):
 
         self.brightness_slider = NandeImageSlider(self)
         self.contrast_slider = NandeImageSlider(self)
+        self.exposure_slider = NandeImageSlider(self)
+        self.gamma_slider = NandeImageSlider(self)
+        for slider in (
+                self.brightness_slider,
+                self.contrast_slider,
+                self.exposure_slider,
+                self.gamma_slider,
+        ):
+            slider.valueChanged.connect(self._adjustment_changed)
 
         layout.addWidget(self.channels_combobox)
         layout.addWidget(self.invert_color_btn)
@@ -132,11 +208,25 @@ class NandeImageAdjustmentToolbar(QWidget):
         layout.addWidget(self.brightness_slider)
         layout.addWidget(QLabel("Contrast:"))
         layout.addWidget(self.contrast_slider)
+        layout.addWidget(QLabel("Exposure:"))
+        layout.addWidget(self.exposure_slider)
+        layout.addWidget(QLabel("Gamma:"))
+        layout.addWidget(self.gamma_slider)
 
     def _channel_changed(self):
         channel_idx = self.channels_combobox.currentData()
         self.parent_.view_channel(channel_idx)
 
+    def _adjustment_changed(self):
+        # Sliders go from -100 to 100, map them to ±0.5 brightness offset,
+        # ±1 contrast, ±5 stops and 0.25 to 4 gamma
+        self.parent_.set_adjustments(
+            brightness=self.brightness_slider.value() / 200,
+            contrast=self.contrast_slider.value() / 100,
+            exposure=self.exposure_slider.value() / 20,
+            gamma=2.0 ** (self.gamma_slider.value() / 50),
+        )
+
 
 class NandeViewToolbar(QWidget):
     def __init__(self, parent: NandeViewer):
@@ -148,6 +238,16 @@ class NandeViewToolbar(QWidget):
         self.use_ocio_checkbox = QCheckBox("Use OCIO")
         self.use_ocio_checkbox.toggled.connect(self._toggled_use_ocio)
 
+        self.use_ocio_lut_checkbox = QCheckBox("Baked LUT")
+        self.use_ocio_lut_checkbox.setToolTip(
+            "Approximate the OCIO display transform with a baked 3D LUT"
+        )
+        self.use_ocio_lut_checkbox.toggled.connect(self._toggled_use_ocio_lut)
+
+        self.ocio_configs_combobox = OCIOConfigsComboBox(self)
+        self.ocio_configs_combobox.setToolTip("OCIO config")
+        self.ocio_configs_combobox.currentIndexChanged.connect(self._ocio_config_changed)
+
         self.ocio_views_combobox = OCIOViewsComboBox(self)
         self.ocio_views_combobox.currentIndexChanged.connect(self._ocio_view_changed)
 
@@ -176,6 +276,8 @@ class NandeViewToolbar(QWidget):
         self.flop_btn.clicked.connect(self.parent_.flop_image)
 
         layout.addWidget(self.use_ocio_checkbox)
+        layout.addWidget(self.use_ocio_lut_checkbox)
+        layout.addWidget(self.ocio_configs_combobox)
         layout.addWidget(self.ocio_displays_combobox)
         layout.addWidget(self.ocio_views_combobox)
         layout.addWidget(self.set_linear_filter_checkbox)
@@ -191,16 +293,44 @@ class NandeViewToolbar(QWidget):
 
     def _post_init(self):
         self._ocio_display_changed()
-        self._ocio_view_changed()
+
+    def _ocio_config_changed(self):
+        if not self.parent_.set_ocio_config(self.ocio_configs_combobox.currentData()):
+            # Back to the config still in use
+            index = self.ocio_configs_combobox.findData(self.parent_.ocio_config)
+            self.ocio_configs_combobox.blockSignals(True)
+            self.ocio_configs_combobox.setCurrentIndex(max(index, 0))
+            self.ocio_configs_combobox.blockSignals(False)
+            return
+
+        try:
+            self.ocio_displays_combobox.populate()
+        except Exception as e:
+            print(f"Woops unable to load OCIO config! {e}")
+            return
+
+        self._ocio_display_changed()
 
     def _ocio_display_changed(self):
-        self.parent_.ocio_display = self.ocio_displays_combobox.currentText()
+        display = self.ocio_displays_combobox.currentText()
+        self.parent_.ocio_display = display
+        try:
+            self.ocio_views_combobox.populate(display)
+        except Exception as e:
+            print(f"Woops unhandled exception! {e}")
+
+        self._ocio_view_changed()
 
     def _ocio_view_changed(self):
         self.parent_.ocio_view = self.ocio_views_combobox.currentText()
+        self.parent_.prepare_ocio_processor()
+        self.parent_.refresh_view()
 
     def _toggled_use_ocio(self):
-        self.parent_._use_ocio = self.use_ocio_checkbox.isChecked()
+        self.parent_.use_ocio(self.use_ocio_checkbox.isChecked())
+
+    def _toggled_use_ocio_lut(self):
+        self.parent_.use_ocio_lut(self.use_ocio_lut_checkbox.isChecked())
 
     def _toggled_linear_filter(self):
         self.parent_.use_linear_filter(self.set_linear_filter_checkbox.isChecked())
@@ -321,7 +451,32 @@ class NandeSettingsToolbar(QWidget):
             return
 
         file_path = os.path.normpath(selected_files[0])
-        self.parent_.load_image(file_path)
+        self.parent_.load_image_async(file_path)
+
+
+def _get_grid_lines(step: int, left: int, top: int, right: int, bottom: int) -> QPolygonF:
+    """
+    Returns the grid lines as consecutive (start, end) point pairs.
+
+    """
+    xs = np.arange(left, right + 1, step, dtype=np.float64)
+    ys = np.arange(top, bottom + 1, step, dtype=np.float64)
+    pairs = np.empty((len(xs) + len(ys), 2, 2), dtype=np.float64)
+    vertical = pairs[:len(xs)]
+    vertical[..., 0] = xs[:, np.newaxis]
+    vertical[:, :, 1] = (top, bottom)
+    horizontal = pairs[len(xs):]
+    horizontal[:, :, 0] = (left, right)
+    horizontal[..., 1] = ys[:, np.newaxis]
+    return get_qpolygonf_from_ndarray(pairs)
+
+
+def _get_grid_points(step: int, left: int, top: int, right: int, bottom: int) -> tuple[np.ndarray, np.ndarray]:
+    xs, ys = np.meshgrid(
+        np.arange(left, right + 1, step, dtype=np.float32),
+        np.arange(top, bottom + 1, step, dtype=np.float32),
+    )
+    return xs.ravel(), ys.ravel()
 
 
 class NandeScene(QGraphicsScene):
@@ -332,6 +487,10 @@ class NandeScene(QGraphicsScene):
     BG_COLOR = (65, 65, 65)
     GRID_COLOR = (40, 40, 40)
     GRID_DIVIDER_COLOR = (90, 90, 90)
+    # Grid spacing on screen is never below this, coarser grids get
+    # decimated instead of filling the view with dots and lines
+    GRID_MIN_PITCH = 4
+    GRID_CACHE_CELLS = 32
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -342,59 +501,73 @@ class NandeScene(QGraphicsScene):
         self._grid_size: int = 50
         self._grid_divider: int = 1
         self._grid_linewidth: int = 1
+        self._grid_cache = LRUCache(max_size=8)
         self.setBackgroundBrush(self._bg_color)
 
-    def _draw_grid(self, painter: QPainter, rect: QRectF, pen: QPen, grid_size: int):
+    def _get_grid_step(self, painter: QPainter, grid_size: int) -> int:
         """
-        Draws the grid lines in the scene.
+        Returns the grid spacing in scene pixels, doubled until consecutive
+        grid points are at least GRID_MIN_PITCH screen pixels apart.
 
         """
-        left = int(rect.left())
-        right = int(rect.right())
-        top = int(rect.top())
-        bottom = int(rect.bottom())
+        transform = painter.worldTransform()
+        scale = math.hypot(transform.m11(), transform.m12())
+        step = max(grid_size, 1)
+        while step * scale < self.GRID_MIN_PITCH:
+            step *= 2
+
+        return step
 
-        first_left = left - (left % grid_size)
-        first_top = top - (top % grid_size)
+    def _get_grid_bounds(self, rect: QRectF, step: int) -> tuple[int, int, int, int]:
+        """
+        Returns the visible rect snapped to blocks of grid cells, so panning
+        by less than a block reuses the cached grid.
+
+        """
+        viewer = self.viewer()
+        if viewer is not None:
+            rect = viewer.mapToScene(viewer.viewport().rect()).boundingRect()
 
-        lines = []
-        lines.extend([
-            QLineF(x, top, x, bottom)
-            for x in range(first_left, right, grid_size)
-        ])
-        lines.extend([
-            QLineF(left, y, right, y)
-            for y in range(first_top, bottom, grid_size)]
+        block = step * self.GRID_CACHE_CELLS
+        left = math.floor(rect.left() / block) * block
+        top = math.floor(rect.top() / block) * block
+        right = math.ceil(rect.right() / block) * block
+        bottom = math.ceil(rect.bottom() / block) * block
+        return left, top, right, bottom
+
+    def _draw_grid(self, painter: QPainter, rect: QRectF, pen: QPen, grid_size: int):
+        """
+        Draws the grid lines in the scene.
+
+        """
+        step = self._get_grid_step(painter, grid_size)
+        bounds = self._get_grid_bounds(rect, step)
+        lines = self._grid_cache.get_or_create(
+            ("lines", step, bounds),
+            lambda: _get_grid_lines(step, *bounds),
         )
 
         pen.setCosmetic(True)
         painter.setPen(pen)
-        painter.drawLines(lines)
+        # Point pairs straight from the polygon storage, no QLineF per line
+        painter.drawLines(lines.data(), len(lines) // 2)
 
     def _draw_dots(self, painter: QPainter, rect: QRectF, pen: QPen, grid_size: int):
         """
         Draws the grid dots in the scene.
 
         """
-        zoom = self.viewer().get_zoom()
-        if zoom < 0:
-            grid_size = int(abs(zoom) / 0.3 + 1) * grid_size
-
-        left = int(rect.left())
-        right = int(rect.right())
-        top = int(rect.top())
-        bottom = int(rect.bottom())
-
-        first_left = left - (left % grid_size)
-        first_top = top - (top % grid_size)
+        step = self._get_grid_step(painter, grid_size)
+        bounds = self._get_grid_bounds(rect, step)
+        xs, ys = self._grid_cache.get_or_create(
+            ("dots", step, bounds),
+            lambda: _get_grid_points(step, *bounds),
+        )
 
         pen.setWidth(self._grid_linewidth)
         pen.setCosmetic(True)
         painter.setPen(pen)
-
-        for x in range(first_left, right, grid_size):
-            for y in range(first_top, bottom, grid_size):
-                painter.drawPoint(int(x), int(y))
+        painter.drawPointsNp(xs, ys)
 
     def viewer(self) -> NandeViewer | None:
         return self.views()[0] if self.views() else None
@@ -438,8 +611,38 @@ class NandeScene(QGraphicsScene):
 
 
 class NandePixmapItem(QGraphicsPixmapItem):
+    """
+    Pixmap item drawing zoomed out views from pre-downsampled mip levels.
+
+    The levels of the current pixmap are built in a worker once the pixmap
+    stopped changing for MIP_BUILD_DELAY, the full res pixmap is drawn until
+    they are ready. Levels are cached per pixmap so switching back to a
+    previous view doesn't rebuild them. Drawing into the pixmap only drops
+    its levels, update_mip_levels has to be called once the drawing is done.
+
+    """
+    MIP_BUILD_DELAY = 100
+    MIP_CACHE_MAX_BYTES = 256 * 1024 ** 2
+
     def __init__(self, use_linear_filter=True, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._mip_levels: list[QPixmap] = []
+        self._mip_cache = LRUCache(
+            max_size=16,
+            max_bytes=self.MIP_CACHE_MAX_BYTES,
+            sizeof=lambda levels: sum(get_nbytes(level) for level in levels),
+        )
+        self._mip_pool = QThreadPool()
+        self._mip_pool.setMaxThreadCount(1)
+        self._mip_request_id: int = 0
+        self._mip_worker: MipBuildWorker | None = None
+        # Pixmap changes (e.g. progressive fills) restart the timer, levels
+        # are only built once the pixmap settled
+        self._mip_timer = QTimer(
+            singleShot=True,
+            interval=self.MIP_BUILD_DELAY,
+            timeout=self._build_mip_levels,
+        )
         self.set_linear_filter(use_linear_filter)
 
     def set_linear_filter(self, use_linear: bool):
@@ -450,13 +653,263 @@ class NandePixmapItem(QGraphicsPixmapItem):
         )
         self.setTransformationMode(mode)
 
+    def setPixmap(self, pixmap: QPixmap):
+        super().setPixmap(pixmap)
+        self.update_mip_levels()
+
+    def update_mip_levels(self):
+        """
+        Use the cached levels of the current pixmap or schedule their build.
+
+        """
+        self._cancel_mip_build()
+        pixmap = self.pixmap()
+        self._mip_levels = self._mip_cache.get(pixmap.cacheKey(), [])
+        if not self._mip_levels and max(pixmap.width(), pixmap.height()) > MIP_MIN_SIZE:
+            self._mip_timer.start()
+
+    def get_mip_levels(self) -> list[QPixmap]:
+        return self._mip_levels
+
+    def set_mip_cache_budget(self, max_bytes: int):
+        self._mip_cache.set_max_bytes(max_bytes)
+
+    def get_mip_cache_info(self) -> dict:
+        return self._mip_cache.stats()
+
+    def _build_mip_levels(self):
+        pixmap = self.pixmap()
+        if pixmap.isNull():
+            return
+
+        self._mip_request_id += 1
+        self._mip_worker = MipBuildWorker(
+            self._mip_request_id,
+            pixmap.toImage(),
+            MIP_MIN_SIZE,
+        )
+        # Queued so the results are handled on the GUI thread, the item isn't
+        # a QObject the connection could take the thread from
+        self._mip_worker.signals.finished.connect(
+            partial(self._on_mip_levels_built, key=pixmap.cacheKey()),
+            Qt.ConnectionType.QueuedConnection,
+        )
+        self._mip_worker.signals.failed.connect(
+            self._on_mip_build_failed,
+            Qt.ConnectionType.QueuedConnection,
+        )
+        self._mip_pool.start(self._mip_worker)
+
+    def _cancel_mip_build(self):
+        self._mip_timer.stop()
+        if self._mip_worker is None:
+            return
+
+        self._mip_worker.cancel()
+        self._mip_worker = None
+        self._mip_request_id += 1
+
+    def _on_mip_levels_built(self, request_id: int, levels: list[QImage], key: int):
+        if request_id != self._mip_request_id:
+            return
+
+        self._mip_worker = None
+        self._mip_levels = [QPixmap.fromImage(level) for level in levels]
+        self._mip_cache.put(key, self._mip_levels)
+        self.update()
+
+    def _on_mip_build_failed(self, request_id: int, message: str):
+        if request_id != self._mip_request_id:
+            return
+
+        self._mip_worker = None
+        print(f"Woops unable to build mip levels! {message}")
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None):
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        level = get_mip_level(lod, len(self._mip_levels) + 1)
+        if not level:
+            super().paint(painter, option, widget)
+            return
+
+        mip = self._mip_levels[level - 1]
+        painter.setRenderHint(
+            QPainter.RenderHint.SmoothPixmapTransform,
+            self.transformationMode() == Qt.TransformationMode.SmoothTransformation,
+        )
+        painter.drawPixmap(
+            QRectF(self.offset(), QSizeF(self.pixmap().size())),
+            mip,
+            QRectF(mip.rect()),
+        )
+
+    def draw_image(self, target: QPoint | QRect, image: QImage):
+        """
+        Paint the image over the pixmap in place, replacing its pixels. The
+        image is stretched when a target rect is given.
+
+        The mip levels are dropped but not rebuilt, progressive fills draw
+        many blocks and call update_mip_levels once done.
+
+        """
+        pixmap = self.pixmap()
+        # Drop the item reference so painting doesn't detach (copy) the
+        # whole pixmap, the base class setPixmap leaves the levels alone
+        QGraphicsPixmapItem.setPixmap(self, QPixmap())
+
+        painter = QPainter(pixmap)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter.drawImage(target, image)
+        painter.end()
+
+        QGraphicsPixmapItem.setPixmap(self, pixmap)
+        if self._mip_levels or self._mip_timer.isActive() or self._mip_worker is not None:
+            self._cancel_mip_build()
+            self._mip_levels = []
+
+
+class NandeGLPixmapItem(NandePixmapItem):
+    """
+    Pixmap item drawing its image through the GLImageRenderer display shader
+    on OpenGL viewports, every view operation then runs on the GPU.
+
+    The pixmap is drawn as is on other paint engines, while it doesn't match
+    the image (e.g. a loading preview) or once the shader path failed, in
+    which case failed gets called so the viewer can render on the CPU.
+
+    """
+    def __init__(self, use_linear_filter=True, *args, **kwargs):
+        super().__init__(use_linear_filter, *args, **kwargs)
+        self.failed: Callable[[str], None] | None = None
+        self._renderer = GLImageRenderer()
+        self._use_gl: bool = False
+
+    def set_gl_enabled(self, enable: bool):
+        self._use_gl = enable
+        if enable:
+            self._renderer.failed = None
+
+        self.update()
+
+    def is_gl_active(self) -> bool:
+        return self._use_gl and self._renderer.failed is None
+
+    def set_gl_image(self, image: np.ndarray):
+        self._renderer.set_image(image)
+        self.update()
+
+    def set_gl_operations(self, **operations):
+        self._renderer.set_operations(**operations)
+        self.update()
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None):
+        engine = painter.paintEngine()
+        if (
+                not self.is_gl_active()
+                or engine is None
+                or engine.type() != QPaintEngine.Type.OpenGL2
+                or self.pixmap().size() != self._renderer.get_image_size()
+        ):
+            super().paint(painter, option, widget)
+            return
+
+        linear = self.transformationMode() == Qt.TransformationMode.SmoothTransformation
+        painter.beginNativePainting()
+        try:
+            self._renderer.draw(painter, widget, linear)
+        except Exception as e:
+            self._renderer.failed = str(e)
+        finally:
+            painter.endNativePainting()
+
+        if self._renderer.failed is not None:
+            super().paint(painter, option, widget)
+            if self.failed is not None:
+                self.failed(self._renderer.failed)
+
+
+class NandeTiledItem(QGraphicsItem):
+    """
+    Framebuffer item drawing a TilePyramid. Only the tiles intersecting the
+    exposed rect are drawn, from the pyramid level matching the current zoom.
+
+    """
+    def __init__(self, pyramid: TilePyramid, use_linear_filter=True, parent=None):
+        super().__init__(parent)
+        self._pyramid = pyramid
+        self._use_linear_filter = use_linear_filter
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+
+    def pyramid(self) -> TilePyramid:
+        return self._pyramid
+
+    def set_pyramid(self, pyramid: TilePyramid):
+        self.prepareGeometryChange()
+        self._pyramid = pyramid
+        self.update()
+
+    def set_linear_filter(self, use_linear: bool):
+        self._use_linear_filter = use_linear
+        self.update()
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(0, 0, self._pyramid.width, self._pyramid.height)
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None):
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        level = self._pyramid.level_for_scale(lod)
+
+        painter.setRenderHint(
+            QPainter.RenderHint.SmoothPixmapTransform,
+            self._use_linear_filter,
+        )
+        for tx, ty in self._pyramid.visible_tiles(level, option.exposedRect):
+            tile = self._pyramid.get_tile(level, tx, ty)
+            painter.drawPixmap(
+                QRectF(self._pyramid.tile_rect(level, tx, ty)),
+                tile,
+                QRectF(tile.rect()),
+            )
+
 
 class NandeViewer(QGraphicsView):
     img_clicked = Signal(QPointF)
     window_title_changed = Signal(str)
+    image_load_progress = Signal(int)
+    image_preview_ready = Signal(QPixmap)
+    image_loaded = Signal(str)
+    image_load_failed = Signal(str)
 
     HUD_FPS_FONT_SIZE = 20
     HUD_TEXT_FONT_SIZE = 16
+    VIEW_CACHE_MAX_BYTES = 512 * 1024 ** 2
+    # Only process the visible region first when it covers less than this
+    # fraction of the image, the rest is filled block by block afterwards
+    VIEWPORT_PROCESS_RATIO = 0.5
+    VIEWPORT_MARGIN = 128
+    FILL_BLOCK_SIZE = 512
+    # Heavy operations (OCIO, luminance) on frames bigger than this show a
+    # strided low res result first, refined block by block in a worker
+    PROGRESSIVE_MIN_PIXELS = 4 * 1024 ** 2
+    PROGRESSIVE_PREVIEW_PIXELS = 256 * 1024
+
+    LOAD_PROGRESS_BUSY = LOAD_PROGRESS_BUSY
+
+    INVERT_NONE = INVERT_NONE
+    INVERT_COLOR = INVERT_COLOR
+    INVERT_LINEAR_COLOR = INVERT_LINEAR_COLOR
+
+    ADJUST_NONE = ADJUST_NONE
+    # Slider changes and mouse pans are coalesced to one refresh per
+    # display frame
+    ADJUST_INTERVAL = 16
+    PAN_INTERVAL = 16
+    # Adjustments are settled once the sliders stopped moving for this long,
+    # only settled views get cached
+    ADJUST_SETTLE_DELAY = 250
+    # The scene rect spans this many visible ranges around the visible one,
+    # panning scrolls within it and only repaints the exposed strips
+    SCENE_PAN_MARGIN = 8
 
     def __init__(self, parent: QWidget):
         super().__init__(parent)
@@ -471,27 +924,91 @@ class NandeViewer(QGraphicsView):
         self.zoom_level: float | None = None
         self._zoom_factor: float | None = None
 
+        self.ocio_config: str | None = None
         self.ocio_display: str | None = None
         self.ocio_view: str | None = None
         self._use_ocio: bool = False
-        self._is_inverted: bool = False
+        self._ocio_lut_size: int | None = None
         self._is_flip: bool = False
         self._is_flop: bool = False
         self._is_panning: bool = False
         self._is_opengl: bool = False
+        self._use_gpu_view: bool = False
         self._show_fps: bool = False
         self._use_linear_filter: bool = False
         self._use_tiles: bool = False
         self._drag_drop_image_enabled: bool = True
+        self._profile: str = PROFILE_PERFORMANCE
+        self._background_transform = QTransform()
 
-        self._framebuffer_item = NandePixmapItem(self._use_linear_filter)
-        self._framebuffer_tiles: QGraphicsItemGroup | None = None
+        self._framebuffer_item = NandeGLPixmapItem(self._use_linear_filter)
+        self._framebuffer_item.failed = self._on_gl_failed
+        self._framebuffer_tiles: NandeTiledItem | None = None
+        self._tile_cache_max_bytes: int = TILE_CACHE_MAX_BYTES
         self._original_framebuffer: QPixmap = QPixmap()
-        self._original_image: numpy.ndarray = np.zeros((1, 1), dtype=BIT_DEPTH)
+        # The original image is kept at its native dtype, the display (8-bit)
+        # image is derived on demand by the graph
+        self._original_image: numpy.ndarray = np.zeros((1, 1), dtype=BitDepth.STD)
+        self._bit_depth = BitDepth()
+        self._has_image: bool = False
+
+        # Channel, invert, adjustments and OCIO stack as nodes of the graph,
+        # each caching its result until a parameter upstream changes
+        self._graph = ImageGraph()
+        self._tiles_key: tuple | None = None
+
+        # Derived display pixmaps of the current image per graph state so
+        # toggling between views doesn't recompute them
+        self._view_cache = LRUCache(
+            max_size=64,
+            max_bytes=self.VIEW_CACHE_MAX_BYTES,
+            sizeof=get_nbytes,
+        )
+        self._memory_tracker = MemoryTracker()
+
+        # Background refinement of the area outside the processed viewport
+        # or of the low res progressive result
+        self._fill_pool = QThreadPool(self)
+        self._fill_pool.setMaxThreadCount(1)
+        self._fill_request_id: int = 0
+        self._fill_key: tuple | None = None
+        self._fill_worker: ImageProcessWorker | None = None
+
+        # Slider changes are only applied by the timer
+        self._pending_adjustments: tuple[float, ...] = self.ADJUST_NONE
+        self._adjust_timer = QTimer(
+            self,
+            singleShot=True,
+            interval=self.ADJUST_INTERVAL,
+            timeout=self._apply_adjustments,
+        )
+        self._adjust_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        # Active while a slider is being dragged
+        self._adjust_settle_timer = QTimer(
+            self,
+            singleShot=True,
+            interval=self.ADJUST_SETTLE_DELAY,
+            timeout=self._on_adjustments_settled,
+        )
+
+        # Mouse pans accumulate in scene units until the timer applies them
+        self._pending_pan = QPointF()
+        self._pan_timer = QTimer(
+            self,
+            singleShot=True,
+            interval=self.PAN_INTERVAL,
+            timeout=self._apply_pan,
+        )
+        self._pan_timer.setTimerType(Qt.TimerType.PreciseTimer)
+
+        # Background image decoding
+        self._load_pool = QThreadPool(self)
+        self._load_pool.setMaxThreadCount(2)
+        self._load_request_id: int = 0
+        self._load_worker: ImageLoadWorker | None = None
 
         self._scene = NandeScene(self)
         self._scene.addItem(self._framebuffer_item)
-        self._scene.addItem(self._framebuffer_tiles)
         self._scene_range = QRectF(
             0, 0,
             self.size().width(), self.size().height(),
@@ -509,11 +1026,7 @@ class NandeViewer(QGraphicsView):
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
 
         self._install_shortcuts()
-
-        # TODO: Need to study the docs on the update/cache/optimization blah
-        # self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
-        # self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
-        # self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing)
+        self.set_performance_profile(self._profile)
 
         # FPS counter
         self._fps: int = 0
@@ -591,12 +1104,13 @@ class NandeViewer(QGraphicsView):
         self._fps = 0
         if not self._is_panning and self._framerate:
             self._framerate = 0
-            self._update_scene()
+
+        self.viewport().update(self._get_hud_rect())
 
     def paintEvent(self, event: QPaintEvent):
         self._fps += 1
 
-        valid_tiles = self._use_tiles and self._framebuffer_tiles
+        valid_tiles = self._framebuffer_tiles is not None
         if not self._framebuffer_item.pixmap() and not valid_tiles:
             text = self.no_image_text
             font = QFont("SansSerif", 40, QFont.Weight.Bold)
@@ -655,10 +1169,11 @@ class NandeViewer(QGraphicsView):
     def use_linear_filter(self, use_linear: bool):
         self._use_linear_filter = use_linear
         self._framebuffer_item.set_linear_filter(use_linear)
+        if self._framebuffer_tiles:
+            self._framebuffer_tiles.set_linear_filter(use_linear)
 
     def _toggle_linear_filter(self):
-        self._use_linear_filter = not self._use_linear_filter
-        self._framebuffer_item.set_linear_filter(self._use_linear_filter)
+        self.use_linear_filter(not self._use_linear_filter)
 
     def use_opengl(self, confirm=True):
         if confirm:
@@ -668,32 +1183,160 @@ class NandeViewer(QGraphicsView):
 
         self._is_opengl = confirm
         self.setViewport(widget)
+        self._update_gpu_view_enabled()
+        self.invalidate_background()
+        self.refresh_view()
+
+    def use_gpu_view(self, toggle: bool):
+        """
+        Run the view operations in the framebuffer item shader while the
+        viewport is OpenGL. Off by default, the CPU graph is the reference.
+
+        """
+        self._use_gpu_view = toggle
+        self._update_gpu_view_enabled()
+        self.refresh_view()
+
+    def _update_gpu_view_enabled(self):
+        requested = self._is_opengl and self._use_gpu_view
+        use_gl = requested and is_gl_available()
+        if requested and not use_gl:
+            print("Woops OpenGL is unavailable, display transforms stay on the CPU!")
+
+        self._framebuffer_item.set_gl_enabled(use_gl)
+
+    def is_gpu_view(self) -> bool:
+        """
+        Returns True when the view operations run on the GPU.
+
+        """
+        return (
+            self._framebuffer_tiles is None
+            and not self._use_tiles
+            and self._framebuffer_item.is_gl_active()
+        )
+
+    def _on_gl_failed(self, message: str):
+        print(f"Woops unable to use OpenGL display transforms! {message}")
+        # Called while painting, the scene can't change before it's done
+        QTimer.singleShot(0, self.refresh_view)
+
+    def set_performance_profile(self, profile: str):
+        """
+        Apply the cache mode, viewport update mode and optimization flags of
+        one of the VIEW_PROFILES.
+
+        """
+        cache_mode, update_mode, flags = VIEW_PROFILES[profile]
+        self._profile = profile
+        self.setCacheMode(cache_mode)
+        self.setViewportUpdateMode(update_mode)
+        self.setOptimizationFlags(flags)
+        self.invalidate_background()
+
+    def get_performance_profile(self) -> str:
+        return self._profile
+
+    def invalidate_background(self):
+        """
+        Drop the cached background layer so the grid and background color
+        get redrawn on the next paint.
+
+        """
+        self._background_transform = self.transform()
+        self.resetCachedContent()
+        self.viewport().update()
+
+    def _update_background_transform(self):
+        # The grid density depends on the zoom and rotation, the cached
+        # background is only valid for the transform it was drawn with
+        if self.transform() != self._background_transform:
+            self.invalidate_background()
+
+    def rotate(self, angle: float):
+        super().rotate(angle)
+        self._update_background_transform()
+
+    def use_ocio_lut(self, toggle: bool, size: int = 33):
+        """
+        Use a baked 3D LUT of the given size instead of the exact OCIO
+        processor for display transforms.
+
+        """
+        self._ocio_lut_size = size if toggle else None
+        self.refresh_view()
+
+    def use_ocio(self, toggle: bool):
+        self._use_ocio = toggle
+        self.refresh_view()
+
+    def get_ocio_config(self) -> OCIO.Config:
+        return get_ocio_config(self.ocio_config)
+
+    def set_ocio_config(self, path: str | None) -> bool:
+        """
+        Use the OCIO config at path (file path or ocio:// URI) for this
+        viewer, None falls back to the session config. The display and view
+        must be set again afterwards.
+
+        Returns False and keeps the current config when the config can't be
+        loaded.
+
+        """
+        try:
+            get_ocio_config(path)
+        except Exception as e:
+            print(f"Woops unable to load OCIO config {path}! {e}")
+            return False
+
+        self.ocio_config = path
+        self.ocio_display = None
+        self.ocio_view = None
+        self.refresh_view()
+        return True
 
     def use_tiles_mode(self, toggle: bool):
         self._use_tiles = toggle
 
+    def set_tile_cache_budget(self, max_bytes: int):
+        """
+        Set the memory budget of the tile cache in bytes. Least recently
+        drawn tiles are evicted first.
+
+        """
+        self._tile_cache_max_bytes = max_bytes
+        if self._framebuffer_tiles:
+            self._framebuffer_tiles.pyramid().set_max_bytes(max_bytes)
+
+    def get_tile_cache_info(self) -> dict:
+        if not self._framebuffer_tiles:
+            return {}
+
+        return self._framebuffer_tiles.pyramid().stats()
+
     def show_fps_counter(self, toggle: bool):
         self._show_fps = toggle
-        self._update_scene()
+        # The HUD is drawn over the viewport, nothing else repaints it
+        self.viewport().update(self._get_hud_rect())
 
     def set_drag_drop_image_enabled(self, enable: bool):
         self._drag_drop_image_enabled = enable
 
     def set_grid_size(self, grid_size: int):
         self._scene._grid_size = grid_size
-        self._update_scene()
+        self.invalidate_background()
 
     def set_grid_divider(self, grid_divider: int):
         self._scene._grid_divider = grid_divider
-        self._update_scene()
+        self.invalidate_background()
 
     def set_grid_linewidth(self, grid_linewidth: int):
         self._scene._grid_linewidth = grid_linewidth
-        self._update_scene()
+        self.invalidate_background()
 
     def set_grid_mode(self, grid_mode: int):
         self._scene._grid_mode = grid_mode
-        self._update_scene()
+        self.invalidate_background()
 
     def get_bg_color(self) -> QColor:
         return self._scene._bg_color
@@ -701,31 +1344,32 @@ class NandeViewer(QGraphicsView):
     def set_bg_color(self, color: QColor):
         self._scene._bg_color = color
         self._scene.setBackgroundBrush(color)
+        self.invalidate_background()
 
     def get_grid_color(self) -> QColor:
         return self._scene._grid_color
 
     def set_grid_color(self, color: QColor):
         self._scene._grid_color = color
-        self._update_scene()
+        self.invalidate_background()
 
     def get_grid_divider_color(self) -> QColor:
         return self._scene._grid_divider_color
 
     def set_grid_divider_color(self, color: QColor):
         self._scene._grid_divider_color = color
-        self._update_scene()
+        self.invalidate_background()
 
     def get_pixmap_item(self) -> QGraphicsPixmapItem:
         return self._framebuffer_item
 
     def get_pixmap_info(self) -> dict:
-        if self._use_tiles and self._framebuffer_tiles:
-            _: QGraphicsPixmapItem = self._framebuffer_tiles.childItems()[0]
+        if self._framebuffer_tiles is not None:
+            tile: QPixmap = self._framebuffer_tiles.pyramid().get_tile(0, 0, 0)
             data = {
                 "width": self._framebuffer_tiles.boundingRect().width(),
                 "height": self._framebuffer_tiles.boundingRect().height(),
-                "depth": _.pixmap().depth(),
+                "depth": tile.depth(),
             }
         else:
             pixmap: QPixmap = self._framebuffer_item.pixmap()
@@ -771,7 +1415,7 @@ class NandeViewer(QGraphicsView):
                 self.current_file_path = file_path
                 self._is_flip = False
                 self._is_flop = False
-                self.load_image(file_path)
+                self.load_image_async(file_path)
 
     def wheelEvent(self, event: QWheelEvent):
         delta_y = event.angleDelta().y()
@@ -783,130 +1427,585 @@ class NandeViewer(QGraphicsView):
         if not self._framebuffer_tiles:
             return
 
-        for item in self._framebuffer_tiles.childItems():
-            self._scene.removeItem(item)
-
-    def _read_convert_image(self, file_path: str, depth: BIT_DEPTH | None = None):
-        if depth is None:
-            depth = BitDepth.FLOAT
-
-        raw = cv2.imread(file_path, flags=cv2.IMREAD_UNCHANGED)
-        channels = cv2.split(raw)
-        channels = [
-            channel.astype(depth) for channel in channels
-        ]
-        return cv2.merge(channels)
+        self._scene.removeItem(self._framebuffer_tiles)
+        self._framebuffer_tiles = None
 
     def load_image(self, file_path: str):
         # TODO: Use QImageReader to construct pixmap tiles from very high res image
         # image = QImageReader(file_path)
-        self._original_image = self._read_convert_image(file_path)
-        self._original_framebuffer = QPixmap(file_path)
+        self._cancel_image_load()
+        mapped = open_memmap(file_path)
+        if mapped is not None:
+            self._set_mapped_image(mapped)
+            return
 
-        img = self._original_image.astype(BitDepth.STD)
-        pixmap = self._get_pixmap_from_ndarray(img)
+        raw = decode_image(file_path)
+        if raw is None:
+            print(f"Woops unable to load image! {file_path}")
+            return
 
-        self._clear_tiles()
+        self._set_decoded_image(raw)
+
+    def _set_decoded_image(self, raw: np.ndarray):
+        """
+        Derive every representation of the image from the single decoded
+        buffer. The decoded buffer is kept at its native dtype as the
+        original image, unless OCIO can't read it (e.g. int16, float64).
+
+        """
+        raw = BitDepth.to_supported(raw)
+        tracker = MemoryTracker()
+        tracker.track("original", raw)
+
+        self._set_original_image(raw)
+        self._memory_tracker = tracker
         if self._use_tiles:
-            tile_size = QSize(512, 512)
-            tiles = []
-            for y in range(0, pixmap.height(), tile_size.height()):
-                for x in range(0, pixmap.width(), tile_size.width()):
-                    w = min(tile_size.width(), pixmap.width() - x)
-                    h = min(tile_size.height(), pixmap.height() - y)
+            # Tiles are built region by region straight from the original
+            # image, no full frame display buffer is created
+            self._original_framebuffer = QPixmap()
+            self._set_framebuffer_tiles(raw)
+            return
 
-                    tile = self._scene.addPixmap(pixmap.copy(x, y, w, h))
-                    tile.setPos(x, y)
-                    tiles.append(tile)
+        display = self.get_display_image()
+        if display is not raw:
+            tracker.track("display", display)
 
-            self._framebuffer_tiles = self._scene.createItemGroup(tiles)
+        self._original_framebuffer = get_pixmap_from_ndarray(display)
+        tracker.track("framebuffer", self._original_framebuffer)
 
+        if self.is_gpu_view():
+            # The shader applies the operations to the original image
+            pixmap = self._original_framebuffer
+            self._update_gpu_view()
         else:
-            self._framebuffer_item.setPixmap(pixmap)
+            pixmap = self._get_view_pixmap()
+
+        if pixmap is not self._original_framebuffer:
+            tracker.track("view", pixmap)
+
+        self._set_framebuffer(pixmap)
+
+    def load_raw_image(
+            self,
+            file_path: str,
+            shape: tuple[int, ...],
+            dtype: np.dtype,
+            offset: int = 0,
+    ):
+        """
+        Memory map a headerless raw dump in OpenCV BGR(A) channel order.
+
+        """
+        self._cancel_image_load()
+        self._set_mapped_image(open_raw(file_path, shape, dtype, offset))
+
+    def _set_mapped_image(self, mapped: np.ndarray):
+        """
+        Use a memory mapped image as the original image. The framebuffer is
+        always tiled so only the regions that get viewed are paged in and
+        converted, tile by tile. Dtypes OCIO can't read are converted, which
+        reads the whole image.
+
+        """
+        mapped = BitDepth.to_supported(mapped)
+        tracker = MemoryTracker()
+        self._set_original_image(mapped)
+        self._memory_tracker = tracker
+        self._original_framebuffer = QPixmap()
+        self._set_framebuffer_tiles(mapped)
+
+    def _set_original_image(self, image: np.ndarray):
+        self._original_image = image
+        self._has_image = True
+        self._bit_depth = BitDepth.from_image(image)
+        self._cancel_fill()
+        self._graph.set_image(image, self._bit_depth)
+        self._framebuffer_item.set_gl_image(image)
+        self._view_cache.clear()
+        clear_ocio_buffers()
+
+    def get_bit_depth(self) -> BitDepth:
+        return self._bit_depth
+
+    def get_display_image(self) -> np.ndarray:
+        """
+        Returns the 8-bit image, which is the original image itself for 8-bit
+        sources.
+
+        """
+        return self._graph.get_display_image()
+
+    def get_memory_info(self) -> dict:
+        """
+        Returns the memory used by the current image buffers and the peak
+        memory while loading it, in bytes.
+
+        """
+        return self._memory_tracker.report()
+
+    def load_image_async(self, file_path: str):
+        """
+        Decode the image in the background and keep the viewer interactive.
+
+        A pending load of a previous file is cancelled and its results are
+        ignored. Progress, a low res preview (when the format supports cheap
+        reduced decoding) and the final image are reported through the
+        image_load_progress, image_preview_ready and image_loaded signals.
+        Progress is the percentage of the file read, then LOAD_PROGRESS_BUSY
+        while decoding and 100 once decoded.
+
+        """
+        self._cancel_image_load()
+        self._load_request_id += 1
+
+        # Mapping is instant, no need for a worker
+        mapped = open_memmap(file_path)
+        if mapped is not None:
+            self.current_file_path = file_path
+            self._set_mapped_image(mapped)
+            self.image_loaded.emit(file_path)
+            return
+
+        worker = ImageLoadWorker(self._load_request_id, file_path)
+        worker.signals.progress.connect(self._on_image_load_progress)
+        worker.signals.preview_ready.connect(self._on_image_preview_ready)
+        worker.signals.finished.connect(
+            partial(self._on_image_load_finished, file_path=file_path)
+        )
+        worker.signals.failed.connect(self._on_image_load_failed)
+
+        self._load_worker = worker
+        self._load_pool.start(worker)
+
+    def _cancel_image_load(self):
+        if self._load_worker is None:
+            return
+
+        self._load_worker.cancel()
+        self._load_worker = None
+        self._load_request_id += 1
+
+    def _is_stale_load(self, request_id: int) -> bool:
+        return request_id != self._load_request_id
+
+    def _on_image_load_progress(self, request_id: int, value: int):
+        if self._is_stale_load(request_id):
+            return
+
+        self.image_load_progress.emit(value)
 
+    def _on_image_preview_ready(self, request_id: int, preview: np.ndarray, full_size: tuple):
+        if self._is_stale_load(request_id):
+            return
+
+        pixmap = get_pixmap_from_ndarray(preview)
+        self._clear_tiles()
+        self._framebuffer_item.setPixmap(pixmap)
+        # Stretch the preview to the full res extent so the final image
+        # replaces it without the view jumping around
+        self._framebuffer_item.setScale(full_size[0] / max(pixmap.width(), 1))
         self.fit_scene_to_image()
+        self.image_preview_ready.emit(pixmap)
+
+    def _on_image_load_finished(self, request_id: int, raw: np.ndarray, file_path: str):
+        if self._is_stale_load(request_id):
+            return
+
+        self._load_worker = None
+        self.current_file_path = file_path
+
+        self._set_decoded_image(raw)
+        self.image_loaded.emit(file_path)
+
+    def _on_image_load_failed(self, request_id: int, message: str):
+        if self._is_stale_load(request_id):
+            return
+
+        self._load_worker = None
+        print(f"Woops unable to load image! {message}")
+        self.image_load_failed.emit(message)
+
+    def _set_framebuffer(self, pixmap: QPixmap):
+        self._framebuffer_item.setScale(1.0)
+        self._clear_tiles()
+        self._framebuffer_item.setPixmap(pixmap)
+        self.fit_scene_to_image()
+
+    def _set_framebuffer_tiles(self, image: np.ndarray):
+        self._framebuffer_item.setScale(1.0)
+        self._framebuffer_item.setPixmap(QPixmap())
+        self._clear_tiles()
+
+        self._sync_graph()
+        self._framebuffer_tiles = NandeTiledItem(
+            self._get_view_pyramid(image),
+            self._use_linear_filter,
+        )
+        self._scene.addItem(self._framebuffer_tiles)
+        self.fit_scene_to_image()
+
+    def _get_view_pyramid(self, image: np.ndarray) -> TilePyramid:
+        # Every tile goes through the graph operations as it gets built
+        self._tiles_key = self._graph.key()
+        return TilePyramid(
+            image,
+            max_bytes=self._tile_cache_max_bytes,
+            convert=self._graph.apply,
+        )
 
     def set_pixmap(self, pixmap: QPixmap):
         img: QImage = pixmap.toImage()
         # TODO: Hmm need to handle alpha channel? For now happy flow with rgb_view...
         raw: np.ndarray = qimage2ndarray.rgb_view(img)
         raw = cv2.cvtColor(raw, cv2.COLOR_RGB2BGR)
-        channels = cv2.split(raw)
-        channels = [
-            channel.astype(BitDepth.FLOAT) for channel in channels
-        ]
-        self._original_image = cv2.merge(channels)
+        self._set_original_image(raw)
 
         self._original_framebuffer = pixmap
         self._framebuffer_item.setPixmap(pixmap)
 
-    def _get_pixmap_from_ndarray(self,image: np.ndarray, disable_ocio=False, *args, **kwargs):
-        if not disable_ocio and self._use_ocio:
-            image = measure_time(
-                ocio_transform,
-                image,
-                view=self.ocio_view,
-                display=self.ocio_display,
-            )
+    def prepare_ocio_processor(self):
+        """
+        Build (or fetch from cache) the OCIO processor for the current
+        display/view so the next redraw doesn't pay for it.
 
-        return get_pixmap_from_ndarray(image, *args, **kwargs)
+        """
+        if not self.ocio_display or not self.ocio_view:
+            return
 
-    def view_channel(self, idx: int | None):
-        if idx is None:
-            pixmap = self._original_framebuffer
-            if self._use_ocio:
-                pixmap = self._get_pixmap_from_ndarray(self._original_image)
+        self._prepare_ocio_processors()
+
+    def _prepare_ocio_processors(self):
+        # OCIO gets the image at its native depth when no other operation is
+        # active and the 8-bit display image otherwise, warm both
+        dtypes = {get_ocio_dtype(self._original_image.dtype), np.dtype(BitDepth.STD)}
+        try:
+            for dtype in dtypes:
+                get_ocio_processor(
+                    display=self.ocio_display,
+                    view=self.ocio_view,
+                    config=self.get_ocio_config(),
+                    bit_depth=OCIO_BIT_DEPTHS[dtype],
+                )
+        except Exception as e:
+            print(f"Woops unable to create OCIO processor! {e}")
+
+    def set_view_cache_budget(self, max_bytes: int):
+        """
+        Set the memory budget of the derived view cache in bytes.
+
+        """
+        self._view_cache.set_max_bytes(max_bytes)
+
+    def get_view_cache_info(self) -> dict:
+        return self._view_cache.stats()
+
+    def get_buffer_pool_info(self) -> dict:
+        return self._graph.buffer_pool.stats()
+
+    def get_graph(self) -> ImageGraph:
+        return self._graph
+
+    def _sync_graph(self):
+        self._graph.set_ocio(
+            self._use_ocio,
+            display=self.ocio_display,
+            view=self.ocio_view,
+            lut_size=self._ocio_lut_size,
+            config=self.ocio_config,
+        )
+
+    def _get_view_pixmap(self) -> QPixmap:
+        self._sync_graph()
+        if self._graph.is_identity():
+            return self._original_framebuffer
+
+        return self._view_cache.get_or_create(
+            self._graph.key(),
+            lambda: get_pixmap_from_ndarray(measure_time(self._graph.evaluate)),
+        )
 
-            self._framebuffer_item.setPixmap(pixmap)
+    def refresh_view(self):
+        """
+        Display the result of the current graph state. Only the operations
+        downstream of the last changed parameter are re-evaluated. Nothing
+        happens until an image got loaded, the settings apply on load.
+
+        """
+        if not self._has_image:
             return
 
-        if idx == ChannelEnum.LUMINANCE:
-            measure_time(self.view_luminance)
+        self._cancel_fill()
+        self._sync_graph()
+        if self._framebuffer_tiles is not None:
+            if self._graph.key() != self._tiles_key:
+                pyramid = self._get_view_pyramid(self._original_image)
+                self._framebuffer_tiles.set_pyramid(pyramid)
             return
 
-        ch = measure_time(get_channel, self._original_image, idx)
-        if ch is None:
+        if self.is_gpu_view():
+            if self._framebuffer_item.pixmap().cacheKey() != self._original_framebuffer.cacheKey():
+                self._framebuffer_item.setPixmap(self._original_framebuffer)
+            self._update_gpu_view()
             return
 
-        pixmap = self._get_pixmap_from_ndarray(ch, disable_ocio=True)
-        self._framebuffer_item.setPixmap(pixmap)
+        key = self._graph.key()
+        if not self._graph.is_identity() and key not in self._view_cache:
+            region = self._get_visible_image_rect()
+            if region is not None:
+                measure_time(self._draw_view_region, region)
+                self._start_fill(key, region)
+                return
 
-    def view_luminance(self):
-        lu = get_luminance(self._original_image)
-        pixmap = self._get_pixmap_from_ndarray(lu, disable_ocio=True)
-        self._framebuffer_item.setPixmap(pixmap)
+            if self._is_progressive():
+                measure_time(self._draw_low_res_view)
+                self._start_fill(key)
+                return
 
-    def view_invert_color(self):
-        self._is_inverted = not self._is_inverted
-        if not self._is_inverted:
-            self.view_channel(None)
+            if self._is_adjusting() and self._is_full_res_framebuffer():
+                measure_time(self._draw_view)
+                return
+
+        self._framebuffer_item.setPixmap(self._get_view_pixmap())
+
+    def _update_gpu_view(self):
+        """
+        Hand the graph state over to the framebuffer item shader. No image
+        processing happens on the CPU, the OCIO transform is baked once per
+        display/view into a 3D LUT.
+
+        """
+        graph = self._graph
+        lut = None
+        # Float images reach OCIO unclipped when no other operation runs,
+        # like the native routing of the CPU graph
+        hdr = self._bit_depth.is_float and graph.bit_depth.params["native"]
+        if not graph.ocio.is_bypassed():
+            params = graph.ocio.params
+            try:
+                lut = bake_ocio_lut(
+                    params["display"],
+                    params["view"],
+                    size=params["lut_size"] or GL_LUT_SIZE,
+                    config=get_ocio_config(params["config"]),
+                    hdr=hdr,
+                )
+            except Exception as e:
+                print(f"Woops unable to bake OCIO LUT! {e}")
+
+        self._framebuffer_item.set_gl_operations(
+            channel=graph.get_channel(),
+            invert=graph.get_invert(),
+            adjustments=graph.get_adjustments(),
+            lut=lut,
+            hdr=hdr,
+        )
+
+    def _is_full_res_framebuffer(self) -> bool:
+        h, w = self._original_image.shape[:2]
+        return self._framebuffer_item.pixmap().size() == QSize(w, h)
+
+    def _is_progressive(self) -> bool:
+        h, w = self._original_image.shape[:2]
+        return (
+            w * h >= self.PROGRESSIVE_MIN_PIXELS
+            and self._graph.is_heavy()
+            and self._is_full_res_framebuffer()
+        )
+
+    def _is_adjusting(self) -> bool:
+        return self._adjust_settle_timer.isActive()
+
+    def _draw_view(self):
+        """
+        Draw the graph result over the framebuffer in place. Only the first
+        draw copies a pixmap shared with the view cache, every following
+        one reuses it and the pooled graph buffers.
+
+        """
+        image = get_qimage_from_ndarray(self._graph.evaluate())
+        self._framebuffer_item.draw_image(QPoint(0, 0), image)
+
+    def _draw_low_res_view(self):
+        """
+        Run the operations on a strided subsample of the image and draw it
+        stretched over the whole framebuffer.
+
+        """
+        h, w = self._original_image.shape[:2]
+        stride = max(int((w * h / self.PROGRESSIVE_PREVIEW_PIXELS) ** 0.5), 1)
+        low_res = self._graph.apply(self._original_image[::stride, ::stride])
+        self._framebuffer_item.draw_image(
+            QRect(0, 0, w, h),
+            get_qimage_from_ndarray(low_res),
+        )
+
+    def _get_visible_image_rect(self) -> QRect | None:
+        """
+        Returns the visible image region plus a margin, in image pixels.
+        None when it covers most of the image and the whole frame should be
+        processed at once.
+
+        """
+        h, w = self._original_image.shape[:2]
+        if self._framebuffer_item.pixmap().size() != QSize(w, h):
+            return None
+
+        scene_rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        rect = self._framebuffer_item.mapRectFromScene(scene_rect).toAlignedRect()
+        margin = self.VIEWPORT_MARGIN
+        rect = rect.adjusted(-margin, -margin, margin, margin) & QRect(0, 0, w, h)
+        if rect.isEmpty() or rect.width() * rect.height() > w * h * self.VIEWPORT_PROCESS_RATIO:
+            return None
+
+        return rect
+
+    def _draw_view_region(self, rect: QRect):
+        region = self._original_image[
+            rect.top():rect.top() + rect.height(),
+            rect.left():rect.left() + rect.width(),
+        ]
+        image = get_qimage_from_ndarray(self._graph.apply(region))
+        self._framebuffer_item.draw_image(rect.topLeft(), image)
+
+    def _start_fill(self, key: tuple, done: QRect | None = None):
+        """
+        Refine the rest of the image block by block in a worker, closest
+        blocks to the already processed region first.
+
+        """
+        h, w = self._original_image.shape[:2]
+        done = done or QRect()
+        center = done.center() if not done.isEmpty() else QPoint(w // 2, h // 2)
+        size = self.FILL_BLOCK_SIZE
+        blocks = [
+            QRect(x, y, min(size, w - x), min(size, h - y))
+            for y in range(0, h, size)
+            for x in range(0, w, size)
+        ]
+        blocks = [block for block in blocks if not done.contains(block)]
+        blocks.sort(key=lambda block: (block.center() - center).manhattanLength())
+
+        self._fill_request_id += 1
+        self._fill_key = key
+        self._fill_worker = ImageProcessWorker(
+            self._fill_request_id,
+            self._original_image,
+            self._graph.get_operations(),
+            [block.getRect() for block in blocks],
+        )
+        self._fill_worker.signals.tile_ready.connect(self._on_fill_tile_ready)
+        self._fill_worker.signals.finished.connect(self._on_fill_finished)
+        self._fill_worker.signals.failed.connect(self._on_fill_failed)
+        self._fill_pool.start(self._fill_worker)
+
+    def _cancel_fill(self):
+        if self._fill_worker is None:
             return
 
-        ic = measure_time(get_invert_color, self._original_image)
-        image_format = QImage.Format.Format_RGB888
-        if len(self._original_image.shape) > 2:
-            _, _, channels = self._original_image.shape
-            if channels > 3:
-                image_format = QImage.Format.Format_RGBA8888_Premultiplied
+        self._fill_worker.cancel()
+        self._fill_worker = None
+        self._fill_key = None
+        self._fill_request_id += 1
 
-        pixmap = self._get_pixmap_from_ndarray(ic, image_format=image_format)
-        self._framebuffer_item.setPixmap(pixmap)
+    def _on_fill_tile_ready(self, request_id: int, rect: tuple, result: np.ndarray):
+        if request_id != self._fill_request_id:
+            return
 
-    def view_invert_linear_color(self):
-        self._is_inverted = not self._is_inverted
-        if not self._is_inverted:
-            self.view_channel(None)
+        x, y, _, _ = rect
+        self._framebuffer_item.draw_image(QPoint(x, y), get_qimage_from_ndarray(result))
+
+    def _on_fill_finished(self, request_id: int):
+        if request_id != self._fill_request_id:
             return
 
-        ic = measure_time(get_invert_linear_color, self._original_image)
-        image_format = QImage.Format.Format_RGB888
-        if len(self._original_image.shape) > 2:
-            _, _, channels = self._original_image.shape
-            if channels > 3:
-                image_format = QImage.Format.Format_RGBA8888_Premultiplied
+        # Views of a slider being dragged are drawn in place, caching them
+        # would evict the other views, the settled one is cached instead
+        if not self._is_adjusting():
+            self._view_cache.put(self._fill_key, self._framebuffer_item.pixmap())
+            self._framebuffer_item.update_mip_levels()
+        self._fill_worker = None
+        self._fill_key = None
 
-        pixmap = self._get_pixmap_from_ndarray(ic, image_format=image_format)
-        self._framebuffer_item.setPixmap(pixmap)
+    def _on_fill_failed(self, request_id: int, message: str):
+        if request_id != self._fill_request_id:
+            return
+
+        self._fill_worker = None
+        self._fill_key = None
+        print(f"Woops unable to process image! {message}")
+
+    def set_adjustments(
+            self,
+            brightness: float | None = None,
+            contrast: float | None = None,
+            exposure: float | None = None,
+            gamma: float | None = None,
+    ):
+        """
+        Set the tone adjustments of the displayed view. Arguments left to
+        None keep their current value.
+
+        Changes are coalesced and applied at most once every ADJUST_INTERVAL
+        ms so dragging a slider doesn't queue full frame recomputes. Until
+        the values settle for ADJUST_SETTLE_DELAY, the view is drawn in place
+        and not cached.
+
+        """
+        values = (brightness, contrast, exposure, gamma)
+        self._pending_adjustments = tuple(
+            current if value is None else float(value)
+            for current, value in zip(self._pending_adjustments, values)
+        )
+        self._adjust_settle_timer.start()
+        if not self._adjust_timer.isActive():
+            self._adjust_timer.start()
+
+    def reset_adjustments(self):
+        self._adjust_timer.stop()
+        self._adjust_settle_timer.stop()
+        self._pending_adjustments = self.ADJUST_NONE
+        self._apply_adjustments()
+
+    def get_adjustments(self) -> tuple[float, ...]:
+        return self._graph.get_adjustments()
+
+    def _apply_adjustments(self):
+        if self._pending_adjustments == self.get_adjustments():
+            return
+
+        self._graph.set_adjustments(self._pending_adjustments)
+        self.refresh_view()
+
+    def _on_adjustments_settled(self):
+        # Pending values are applied first, the refresh then caches the view
+        self._adjust_timer.stop()
+        self._graph.set_adjustments(self._pending_adjustments)
+        self.refresh_view()
+
+    def view_channel(self, idx: int | None):
+        if idx == ChannelEnum.LUMINANCE:
+            measure_time(self.view_luminance)
+            return
+
+        self._graph.set_channel(idx)
+        self.refresh_view()
+
+    def view_luminance(self):
+        self._graph.set_channel(ChannelEnum.LUMINANCE)
+        self.refresh_view()
+
+    def _toggle_invert(self, mode: str):
+        if self._graph.get_invert() == mode:
+            mode = self.INVERT_NONE
+
+        self._graph.set_invert(mode)
+        self.refresh_view()
+
+    def view_invert_color(self):
+        self._toggle_invert(self.INVERT_COLOR)
+
+    def view_invert_linear_color(self):
+        self._toggle_invert(self.INVERT_LINEAR_COLOR)
 
     def _set_viewer_zoom(self, value: float, sensitivity: float = None, pos: QPoint = None):
         """
@@ -1024,11 +2123,10 @@ class NandeViewer(QGraphicsView):
         previous_pos = self.mapToScene(self._previous_pos)
         current_pos = self.mapToScene(event.scenePosition().toPoint())
 
-        delta = previous_pos - current_pos
-        self._set_viewer_pan(
-            pos_x=delta.x(),
-            pos_y=delta.y(),
-        )
+        self._pending_pan += previous_pos - current_pos
+        if not self._pan_timer.isActive():
+            self._pan_timer.start()
+
         self._previous_pos = event.scenePosition().toPoint()
 
     def mouseReleaseEvent(self, event: QMouseEvent):
@@ -1039,6 +2137,7 @@ class NandeViewer(QGraphicsView):
         elif event.button() == Qt.MouseButton.MiddleButton:
             self.MMB_state = False
 
+        self._apply_pan()
         self._toggle_hand_display()
         super().mouseReleaseEvent(event)
 
@@ -1050,9 +2149,47 @@ class NandeViewer(QGraphicsView):
         self._scene_range.adjust(pos_x, pos_y, pos_x, pos_y)
         self._update_scene()
 
+    def _apply_pan(self):
+        self._pan_timer.stop()
+        if self._pending_pan.isNull():
+            return
+
+        delta = self._pending_pan
+        self._pending_pan = QPointF()
+        self._set_viewer_pan(delta.x(), delta.y())
+
     def _update_scene(self):
-        self.setSceneRect(self._scene_range)
-        self._scene.update()
+        # The scene rect only changes once the visible range leaves it, in
+        # between the view scrolls its contents and repaints the exposed
+        # strips instead of the whole scene
+        if not self.sceneRect().contains(self._scene_range):
+            margin = max(self._scene_range.width(), self._scene_range.height())
+            margin *= self.SCENE_PAN_MARGIN
+            self.setSceneRect(
+                self._scene_range.adjusted(-margin, -margin, margin, margin)
+            )
+
+        self.centerOn(self._scene_range.center())
+
+    def _get_hud_rect(self) -> QRect:
+        return QRect(
+            0, 0,
+            self.HUD_FPS_FONT_SIZE * 6,
+            self.HUD_TEXT_FONT_SIZE * 3,
+        )
+
+    def scrollContentsBy(self, dx: int, dy: int):
+        super().scrollContentsBy(dx, dy)
+        valid_tiles = self._framebuffer_tiles is not None
+        if not self._framebuffer_item.pixmap() and not valid_tiles:
+            # The no image text is drawn at a fixed position
+            self.viewport().update()
+        elif self._show_fps:
+            # The HUD doesn't scroll with the scene, repaint where it got
+            # scrolled to and where it belongs
+            rect = self._get_hud_rect()
+            self.viewport().update(rect.translated(dx, dy))
+            self.viewport().update(rect)
 
     def _fit_scene_in_view(self):
         self._update_scene()
@@ -1060,23 +2197,26 @@ class NandeViewer(QGraphicsView):
             self._scene_range,
             Qt.AspectRatioMode.KeepAspectRatio,
         )
+        self._update_background_transform()
         self._update_window_title()
 
     def force_update(self):
         self._update_scene()
+        self._scene.update()
 
     def fit_scene_to_image(self):
         self.zoom_level = None
 
         self._scene_range.setX(0.0)
         self._scene_range.setY(0.0)
-        if self._use_tiles and self._framebuffer_tiles:
+        if self._framebuffer_tiles is not None:
             rect: QRectF = self._framebuffer_tiles.boundingRect()
             self._scene_range.setWidth(rect.width())
             self._scene_range.setHeight(rect.height())
         else:
-            self._scene_range.setWidth(self._framebuffer_item.pixmap().width())
-            self._scene_range.setHeight(self._framebuffer_item.pixmap().height())
+            scale = self._framebuffer_item.scale()
+            self._scene_range.setWidth(self._framebuffer_item.pixmap().width() * scale)
+            self._scene_range.setHeight(self._framebuffer_item.pixmap().height() * scale)
 
         self._fit_scene_in_view()
 
@@ -1095,7 +2235,7 @@ class NandeViewer(QGraphicsView):
     def flip_image(self):
         self._is_flip = not self._is_flip
 
-        if self._use_tiles and self._framebuffer_tiles:
+        if self._framebuffer_tiles is not None:
             rect: QRectF = self._framebuffer_tiles.boundingRect()
             transform = self._flip_transform(rect)
 
@@ -1120,7 +2260,7 @@ class NandeViewer(QGraphicsView):
     def flop_image(self):
         self._is_flop = not self._is_flop
 
-        if self._use_tiles and self._framebuffer_tiles:
+        if self._framebuffer_tiles is not None:
             rect: QRectF = self._framebuffer_tiles.boundingRect()
             transform = self._flop_transform(rect)
             self._framebuffer_tiles.setTransform(transform, combine=True)
@@ -1130,9 +2270,9 @@ class NandeViewer(QGraphicsView):
             self._framebuffer_item.setTransform(transform, combine=True)
 
     def _recalculate_scene_zoom(self):
-        if self._use_tiles and self._framebuffer_tiles:
+        if self._framebuffer_tiles is not None:
             pix_width = self._framebuffer_tiles.boundingRect().width()
-            pix_height = self._framebuffer_tiles.boundingRect().width()
+            pix_height = self._framebuffer_tiles.boundingRect().height()
         else:
             pix_width = self._framebuffer_item.pixmap().width()
             pix_height = self._framebuffer_item.pixmap().height()
@@ -1149,6 +2289,7 @@ class NandeViewer(QGraphicsView):
         )
         self._update_scene()
         self.resetTransform()
+        self._update_background_transform()
 
     def reset_scene_zoom(self):
         self.zoom_level = None
@@ -0,0 +1,279 @@
+import os
+import threading
+from typing import Callable
+
+import cv2
+import numpy as np
+from PySide6.QtCore import QObject, QRunnable, Signal
+from PySide6.QtGui import QImage, QImageReader
+
+from nande.tiles import get_half_image
+from nande.utils import (
+    decode_image,
+    decode_image_buffer,
+    get_ndarray_from_qimage,
+    get_qimage_from_ndarray,
+)
+
+# Formats where OpenCV can decode a reduced size image cheaply (DCT scaling)
+REDUCED_DECODE_FORMATS = (
+    ".jpg",
+    ".jpeg",
+    ".jfif",
+)
+PREVIEW_MAX_SIZE = 1024
+# Files are read in chunks of this size to report real progress
+READ_CHUNK_SIZE = 4 * 1024 ** 2
+# Progress value while decoding, the decode has no measurable progress
+LOAD_PROGRESS_BUSY = -1
+# QImage formats with one byte (or 16-bit gray) per channel which can be area
+# averaged as is, other formats are converted to ARGB32_Premultiplied first
+MIP_FORMATS = (
+    QImage.Format.Format_Grayscale8,
+    QImage.Format.Format_Grayscale16,
+    QImage.Format.Format_RGB888,
+    QImage.Format.Format_BGR888,
+    QImage.Format.Format_RGB32,
+    QImage.Format.Format_ARGB32,
+    QImage.Format.Format_ARGB32_Premultiplied,
+    QImage.Format.Format_RGBX8888,
+    QImage.Format.Format_RGBA8888,
+    QImage.Format.Format_RGBA8888_Premultiplied,
+)
+
+
+class ImageLoadSignals(QObject):
+    progress = Signal(int, int)
+    preview_ready = Signal(int, object, object)
+    finished = Signal(int, object)
+    failed = Signal(int, str)
+
+
+class ImageLoadWorker(QRunnable):
+    """
+    Decode an image off the GUI thread.
+
+    The file is read in chunks and progress reports the percentage read,
+    then LOAD_PROGRESS_BUSY while the bytes are decoded and 100 once done.
+    Every signal carries the request id so the receiver can drop results of
+    stale requests. Cancelling stops the worker between chunks, the decode
+    itself can't be interrupted.
+
+    """
+    def __init__(self, request_id: int, file_path: str):
+        super().__init__()
+        self.request_id = request_id
+        self.file_path = file_path
+        self.signals = ImageLoadSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _emit_progress(self, value: int):
+        self.signals.progress.emit(self.request_id, value)
+
+    def _read_file(self) -> np.ndarray | None:
+        """
+        Returns the file bytes, None when cancelled while reading.
+
+        """
+        size = os.path.getsize(self.file_path)
+        buffer = np.empty(size, dtype=np.uint8)
+        view = memoryview(buffer)
+        read = 0
+        with open(self.file_path, "rb") as f:
+            while read < size:
+                if self.is_cancelled():
+                    return None
+
+                count = f.readinto(view[read:read + READ_CHUNK_SIZE])
+                if not count:
+                    break
+
+                read += count
+                self._emit_progress(read * 100 // max(size, 1))
+
+        return buffer[:read]
+
+    def _read_preview(self, buffer: np.ndarray) -> np.ndarray | None:
+        _, ext = os.path.splitext(self.file_path)
+        if ext.lower() not in REDUCED_DECODE_FORMATS:
+            return None
+
+        reader = QImageReader(self.file_path)
+        size = reader.size()
+        longest = max(size.width(), size.height())
+        if longest <= PREVIEW_MAX_SIZE:
+            return None
+
+        flag = cv2.IMREAD_REDUCED_COLOR_2
+        if longest > PREVIEW_MAX_SIZE * 4:
+            flag = cv2.IMREAD_REDUCED_COLOR_8
+        elif longest > PREVIEW_MAX_SIZE * 2:
+            flag = cv2.IMREAD_REDUCED_COLOR_4
+
+        # Reduced decodes apply the EXIF orientation unlike the full decode
+        # and QImageReader.size, keep the stored orientation for all of them
+        preview = cv2.imdecode(buffer, flags=flag | cv2.IMREAD_IGNORE_ORIENTATION)
+        if preview is None:
+            return None
+
+        self.signals.preview_ready.emit(
+            self.request_id,
+            preview,
+            (size.width(), size.height()),
+        )
+        return preview
+
+    def run(self):
+        try:
+            self._emit_progress(0)
+            buffer = self._read_file()
+            if buffer is None:
+                return
+
+            self._read_preview(buffer)
+            if self.is_cancelled():
+                return
+
+            self._emit_progress(LOAD_PROGRESS_BUSY)
+            raw = decode_image_buffer(buffer)
+            del buffer
+            if raw is None:
+                # Formats OpenCV only decodes from a file path
+                raw = decode_image(self.file_path)
+
+            if raw is None:
+                self.signals.failed.emit(self.request_id, f"Unable to read {self.file_path}")
+                return
+
+            if self.is_cancelled():
+                return
+
+            self._emit_progress(100)
+            self.signals.finished.emit(self.request_id, raw)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, str(e))
+
+
+class ImageProcessSignals(QObject):
+    tile_ready = Signal(int, object, object)
+    finished = Signal(int)
+    failed = Signal(int, str)
+
+
+class ImageProcessWorker(QRunnable):
+    """
+    Run the image operations on regions of the image off the GUI thread.
+
+    Each processed region is emitted as soon as it is done so the receiver
+    can refine the displayed image progressively. The operations are bound
+    to their parameters at creation, cancelling only stops the worker
+    before the next region.
+
+    """
+    def __init__(
+            self,
+            request_id: int,
+            image: np.ndarray,
+            operations: list[Callable[[np.ndarray], np.ndarray]],
+            regions: list[tuple[int, int, int, int]],
+    ):
+        """
+        Parameters
+        ----------
+        request_id : int
+            Carried by every signal so stale results can be dropped
+        image : np.ndarray
+            Source image
+        operations : list[Callable]
+            Applied in order on every region
+        regions : list[tuple[int, int, int, int]]
+            (x, y, width, height) regions in processing order
+
+        """
+        super().__init__()
+        self.request_id = request_id
+        self.image = image
+        self.operations = operations
+        self.regions = regions
+        self.signals = ImageProcessSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def run(self):
+        try:
+            for x, y, w, h in self.regions:
+                if self.is_cancelled():
+                    return
+
+                result = self.image[y:y + h, x:x + w]
+                for operation in self.operations:
+                    result = operation(result)
+
+                self.signals.tile_ready.emit(self.request_id, (x, y, w, h), result)
+
+            self.signals.finished.emit(self.request_id)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, str(e))
+
+
+class MipBuildSignals(QObject):
+    finished = Signal(int, object)
+    failed = Signal(int, str)
+
+
+class MipBuildWorker(QRunnable):
+    """
+    Build the downsampled mip levels of a display image off the GUI thread.
+
+    Every level halves the previous one with area averaging until its
+    longest side fits min_size. The levels are emitted as QImages since
+    pixmaps can only be created on the GUI thread. The source image is
+    released as soon as the first level is done so painting over the
+    original pixmap doesn't have to detach it for long.
+
+    """
+    def __init__(self, request_id: int, image: QImage, min_size: int):
+        super().__init__()
+        self.request_id = request_id
+        self.image = image
+        self.min_size = min_size
+        self.signals = MipBuildSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def run(self):
+        try:
+            source, self.image = self.image, None
+            if source.format() not in MIP_FORMATS:
+                source = source.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+
+            image_format = source.format()
+            image = get_ndarray_from_qimage(source)
+            levels = []
+            while max(image.shape[:2]) > self.min_size:
+                if self.is_cancelled():
+                    return
+
+                image = get_half_image(image)
+                levels.append(get_qimage_from_ndarray(image, image_format=image_format))
+                source = None
+
+            self.signals.finished.emit(self.request_id, levels)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, str(e))
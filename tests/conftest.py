@@ -0,0 +1,13 @@
+import os
+
+import pytest
+
+# Qt widgets and pixmaps need a platform, the tests don't need a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from nande import BitDepth
+from nande.utils import ocio_transform
+
+
+@pytest.mark.parametrize("dtype", BitDepth.SUPPORTED)
+def test_supported_dtypes_are_kept(dtype):
+    image = np.zeros((4, 4, 3), dtype=dtype)
+    assert BitDepth.to_supported(image) is image
+
+
+@pytest.mark.parametrize("dtype", [np.int8, np.int16, np.int32, np.uint32])
+def test_integers_are_normalized(dtype):
+    max_value = np.iinfo(dtype).max
+    image = np.array([[0, max_value // 2, max_value]], dtype=dtype)
+
+    converted = BitDepth.to_supported(image)
+    assert converted.dtype == np.float32
+    np.testing.assert_allclose(converted, [[0.0, 0.5, 1.0]], atol=1e-2)
+    display = BitDepth.from_image(converted).to_std(converted)
+    np.testing.assert_allclose(display, [[0, 127, 255]], atol=1)
+
+
+def test_float64_keeps_its_values():
+    image = np.array([[0.0, 0.5, 4.0]])
+    converted = BitDepth.to_supported(image)
+    assert converted.dtype == np.float32
+    np.testing.assert_array_equal(converted, image)
+
+
+@pytest.mark.parametrize("dtype", [np.int16, np.int32])
+def test_ocio_rejects_unnormalized_integers(dtype):
+    image = np.zeros((4, 4, 3), dtype=dtype)
+    with pytest.raises(ValueError):
+        ocio_transform(image, scale=1.0)
+
+    ocio_transform(BitDepth.to_supported(image), scale=1.0)
+
+
+def test_to_std():
+    image = np.array([[0, 257, 65535]], dtype=np.uint16)
+    np.testing.assert_array_equal(BitDepth.from_image(image).to_std(image), [[0, 1, 255]])
+
+    image = np.array([[-1.0, 0.5, 2.0]], dtype=np.float32)
+    np.testing.assert_array_equal(BitDepth.from_image(image).to_std(image), [[0, 127, 255]])
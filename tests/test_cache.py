@@ -0,0 +1,106 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from nande.cache import BufferPool, LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.get("b", "missing") == "missing"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_cache_byte_budget():
+    cache = LRUCache(max_size=10, max_bytes=100, sizeof=lambda value: value.nbytes)
+    cache.put("a", np.zeros(40, dtype=np.uint8))
+    cache.put("b", np.zeros(40, dtype=np.uint8))
+    assert cache.nbytes == 80
+
+    cache.put("c", np.zeros(40, dtype=np.uint8))
+    assert "a" not in cache
+    assert cache.nbytes == 80
+
+    cache.set_max_bytes(50)
+    assert list(cache._items) == ["c"]
+    assert cache.nbytes == 40
+
+    # The most recent item is kept even when it is over budget
+    cache.put("d", np.zeros(200, dtype=np.uint8))
+    assert len(cache) == 1 and cache.nbytes == 200
+
+
+def test_lru_cache_replace_and_pop_keep_nbytes():
+    cache = LRUCache(sizeof=len)
+    cache.put("a", "xxxx")
+    cache.put("a", "xx")
+    assert cache.nbytes == 2
+    assert cache.pop("a") == "xx"
+    assert cache.pop("a") is None
+    assert cache.nbytes == 0
+
+
+def test_lru_cache_get_or_create_builds_once():
+    cache = LRUCache()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_create("key", factory) == "value"
+    assert cache.get_or_create("key", factory) == "value"
+    assert len(calls) == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_buffer_pool_reuses_buffers():
+    pool = BufferPool()
+    buffer = pool.get("slot", (4, 5, 3), np.uint8)
+    assert pool.get("slot", (4, 5, 3), np.uint8) is buffer
+    assert pool.allocations == 1
+
+    assert pool.get("slot", (4, 6, 3), np.uint8) is not buffer
+    assert pool.get("slot", (4, 6, 3), np.float32).dtype == np.float32
+    assert pool.allocations == 3
+    assert pool.stats() == {"slots": 1, "nbytes": 4 * 6 * 3 * 4, "allocations": 3}
+
+    pool.clear()
+    assert pool.nbytes == 0
+
+
+def test_lru_cache_is_thread_safe():
+    cache = LRUCache(max_size=4, max_bytes=64, sizeof=len)
+
+    def hammer(seed: int) -> list:
+        rng = np.random.default_rng(seed)
+        results = []
+        for key in rng.integers(0, 16, 20000).tolist():
+            results.append(cache.get_or_create(key, lambda: "x" * (key + 1)))
+            cache.get(key + 1)
+            if key % 5 == 0:
+                cache.put(-key, "y")
+        return results
+
+    # Switch threads as often as possible to interleave the cache methods
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(4) as executor:
+            results = [value for values in executor.map(hammer, range(4)) for value in values]
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert None not in results
+    assert len(cache) <= 4
+    assert cache.nbytes == sum(len(value) for value in cache._items.values())
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from PySide6.QtGui import QImage, QOffscreenSurface, QOpenGLContext, QPainter
+from PySide6.QtOpenGL import QOpenGLFramebufferObject, QOpenGLPaintDevice
+
+from nande import get_ocio_config
+from nande.gl import GL_LUT_SIZE, GLImageRenderer, is_gl_available
+from nande.graph import INVERT_COLOR, INVERT_LINEAR_COLOR, ImageGraph
+from nande.utils import ChannelEnum, bake_ocio_lut, get_ndarray_from_qimage
+
+
+@pytest.fixture()
+def gl_context(qapp):
+    if not is_gl_available():
+        pytest.skip("No OpenGL context available on this platform")
+
+    surface = QOffscreenSurface()
+    surface.create()
+    context = QOpenGLContext()
+    assert context.create()
+    assert context.makeCurrent(surface)
+    yield context
+    context.doneCurrent()
+
+
+def render(renderer: GLImageRenderer, w: int, h: int) -> np.ndarray:
+    fbo = QOpenGLFramebufferObject(w, h)
+    fbo.bind()
+    device = QOpenGLPaintDevice(w, h)
+    painter = QPainter(device)
+    painter.beginNativePainting()
+    try:
+        renderer.draw(painter, None, linear=False)
+    finally:
+        painter.endNativePainting()
+        painter.end()
+    fbo.release()
+
+    image = fbo.toImage().convertToFormat(QImage.Format.Format_ARGB32)
+    return get_ndarray_from_qimage(image).copy()
+
+
+@pytest.mark.parametrize(
+    "channel, invert, adjustments, ocio, tolerance",
+    [
+        (None, None, (0.0, 0.0, 0.0, 1.0), False, 1),
+        (ChannelEnum.RED, None, (0.0, 0.0, 0.0, 1.0), False, 1),
+        (None, INVERT_COLOR, (0.0, 0.0, 0.0, 1.0), False, 1),
+        (ChannelEnum.GREEN, INVERT_COLOR, (0.0, 0.0, 0.0, 1.0), False, 1),
+        (None, INVERT_LINEAR_COLOR, (0.0, 0.0, 0.0, 1.0), False, 4),
+        (None, None, (0.1, 0.2, 0.5, 1.2), False, 1),
+        (None, None, (0.0, 0.0, 0.0, 1.0), True, 9),
+    ],
+)
+def test_shader_matches_cpu_graph(gl_context, channel, invert, adjustments, ocio, tolerance):
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (64, 96, 3), dtype=np.uint8)
+
+    graph = ImageGraph()
+    graph.set_image(image)
+    graph.set_channel(channel)
+    graph.set_invert(invert)
+    graph.set_adjustments(adjustments)
+    graph.set_ocio(ocio)
+    expected = graph.evaluate()
+
+    lut = None
+    if ocio:
+        config = get_ocio_config()
+        lut = bake_ocio_lut(size=GL_LUT_SIZE, config=config)
+
+    renderer = GLImageRenderer()
+    renderer.set_image(image)
+    renderer.set_operations(channel=channel, invert=invert, adjustments=adjustments, lut=lut)
+    result = render(renderer, 96, 64)
+    renderer.release()
+
+    assert renderer.failed is None
+    error = np.abs(result[..., :3].astype(int) - expected[..., :3].astype(int))
+    assert error.max() <= tolerance
+    assert (result[..., 3] == 255).all()
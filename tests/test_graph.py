@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+import nande
+from nande.graph import ADJUST_NONE, INVERT_COLOR, ImageGraph
+from nande.utils import ChannelEnum, get_invert_color, ocio_transform
+
+
+@pytest.fixture()
+def image():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (16, 24, 3), dtype=np.uint8)
+
+
+def test_identity_graph_returns_display_image(image):
+    graph = ImageGraph()
+    graph.set_image(image)
+
+    assert graph.is_identity()
+    assert graph.key() == ()
+    assert graph.evaluate() is image
+    # Only the bit depth conversion, regions of the source still need it
+    assert len(graph.get_operations()) == 1
+
+
+def test_operations_only_reevaluate_downstream(image):
+    graph = ImageGraph()
+    graph.set_image(image)
+    graph.set_invert(INVERT_COLOR)
+    np.testing.assert_array_equal(graph.evaluate(), 255 - image)
+
+    graph.set_adjustments((0.1, 0.0, 0.0, 1.0))
+    graph.evaluate()
+    graph.evaluate()
+    stats = graph.stats()
+    assert stats["invert"] == 1
+    assert stats["adjust"] == 1
+
+    graph.set_adjustments(ADJUST_NONE)
+    np.testing.assert_array_equal(graph.evaluate(), 255 - image)
+    assert graph.key() == (("invert", (INVERT_COLOR,)),)
+
+
+def test_ocio_routing(image):
+    graph = ImageGraph()
+    graph.set_image(image)
+    graph.set_ocio(True)
+    assert graph.bit_depth.params["native"]
+    np.testing.assert_array_equal(graph.evaluate(), ocio_transform(image))
+
+    # Any 8-bit operation in between needs the converted image
+    graph.set_invert(INVERT_COLOR)
+    assert not graph.bit_depth.params["native"]
+    np.testing.assert_array_equal(graph.evaluate(), ocio_transform(get_invert_color(image)))
+
+    # Isolated channels are data and bypass the display transform
+    graph.set_invert(None)
+    graph.set_channel(ChannelEnum.RED)
+    assert graph.ocio.is_bypassed()
+    assert not graph.bit_depth.params["native"]
+    assert not graph.is_heavy()
+
+
+def test_apply_matches_evaluate_on_regions(image):
+    graph = ImageGraph()
+    graph.set_image(image)
+    graph.set_invert(INVERT_COLOR)
+    graph.set_adjustments((0.1, 0.2, 0.0, 1.0))
+    expected = graph.evaluate()
+
+    region = graph.apply(image[4:12, 8:20])
+    np.testing.assert_array_equal(region, expected[4:12, 8:20])
+
+
+def test_gray_image_through_every_operation():
+    image = np.arange(12 * 16, dtype=np.uint8).reshape(12, 16)
+    graph = ImageGraph()
+    graph.set_image(image)
+    graph.set_invert(INVERT_COLOR)
+    graph.set_adjustments((0.1, 0.0, 0.0, 1.0))
+    graph.set_ocio(True)
+
+    assert graph.evaluate().shape == (12, 16, 3)
+
+
+def test_ocio_key_follows_session_config(image, monkeypatch):
+    monkeypatch.setattr(nande, "_ocio_config_path", None)
+    graph = ImageGraph()
+    graph.set_image(image)
+    graph.set_ocio(True)
+    key = graph.key()
+
+    configs = list(nande.get_builtin_ocio_configs())
+    config = next(c for c in configs if nande.get_ocio_config(c) is not nande.get_ocio_config())
+    nande.set_ocio_config_path(config)
+    graph.set_ocio(True)
+    assert graph.key() != key
+    assert graph.ocio.params["config_id"] == nande.get_ocio_config(config).getCacheID()
@@ -0,0 +1,151 @@
+import struct
+
+import numpy as np
+import pytest
+
+from nande.loaders import open_memmap, open_npy, open_uncompressed_tiff
+
+# SampleFormat of unsigned integer and float samples
+UINT = 1
+FLOAT = 3
+MINISBLACK = 1
+RGB = 2
+PALETTE = 3
+
+
+def write_tiff(path, data: np.ndarray, photometric: int, sample_format: int = UINT):
+    """
+    Write a minimal little-endian, uncompressed, single strip TIFF.
+
+    """
+    height, width = data.shape[:2]
+    channels = 1 if data.ndim == 2 else data.shape[2]
+    bits = data.dtype.itemsize * 8
+    pixels = data.astype(data.dtype.newbyteorder("<")).tobytes()
+
+    # (tag, type, count, value), SHORT values fit the 4 bytes of the entry
+    entries = [
+        (256, 4, 1, width),
+        (257, 4, 1, height),
+        (258, 3, 1, bits),
+        (259, 3, 1, 1),
+        (262, 3, 1, photometric),
+        (273, 4, 1, 0),
+        (277, 3, 1, channels),
+        (279, 4, 1, len(pixels)),
+        (284, 3, 1, 1),
+        (339, 3, 1, sample_format),
+    ]
+    if channels > 1:
+        # Multiple BitsPerSample values don't fit, they go after the IFD
+        entries[2] = (258, 3, channels, None)
+
+    ifd_size = 2 + len(entries) * 12 + 4
+    extra = struct.pack(f"<{channels}H", *[bits] * channels) if channels > 1 else b""
+    pixel_offset = 8 + ifd_size + len(extra)
+
+    ifd = struct.pack("<H", len(entries))
+    for tag, field_type, count, value in entries:
+        if tag == 273:
+            value = pixel_offset
+        if value is None:
+            ifd += struct.pack("<HHII", tag, field_type, count, 8 + ifd_size)
+        elif field_type == 3:
+            ifd += struct.pack("<HHIHH", tag, field_type, count, value, 0)
+        else:
+            ifd += struct.pack("<HHII", tag, field_type, count, value)
+    ifd += struct.pack("<I", 0)
+
+    with open(path, "wb") as f:
+        f.write(b"II" + struct.pack("<HI", 42, 8) + ifd + extra + pixels)
+
+
+@pytest.fixture()
+def rgb():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (6, 10, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("dtype, sample_format", [
+    (np.uint8, UINT),
+    (np.uint16, UINT),
+    (np.float16, FLOAT),
+    (np.float32, FLOAT),
+])
+def test_tiff_rgb_reads_as_bgr(tmp_path, rgb, dtype, sample_format):
+    data = rgb.astype(dtype)
+    path = tmp_path / "image.tif"
+    write_tiff(path, data, RGB, sample_format)
+
+    image = open_uncompressed_tiff(str(path))
+    assert isinstance(image.base, np.memmap)
+    assert image.dtype == dtype
+    np.testing.assert_array_equal(image, data[..., ::-1])
+
+
+def test_tiff_gray(tmp_path, rgb):
+    path = tmp_path / "image.tif"
+    write_tiff(path, rgb[..., 0], MINISBLACK)
+    np.testing.assert_array_equal(open_memmap(str(path)), rgb[..., 0])
+
+
+def test_tiff_rejects_uint32(tmp_path, rgb):
+    path = tmp_path / "image.tif"
+    write_tiff(path, rgb.astype(np.uint32), RGB)
+    assert open_uncompressed_tiff(str(path)) is None
+
+
+@pytest.mark.parametrize("photometric", [0, PALETTE])
+def test_tiff_rejects_non_gray_photometrics(tmp_path, rgb, photometric):
+    # WhiteIsZero and palette indices aren't displayable values
+    path = tmp_path / "image.tif"
+    write_tiff(path, rgb[..., 0], photometric)
+    assert open_uncompressed_tiff(str(path)) is None
+
+
+def test_tiff_rejects_rgb_photometric_mismatch(tmp_path, rgb):
+    path = tmp_path / "image.tif"
+    write_tiff(path, rgb, MINISBLACK)
+    assert open_uncompressed_tiff(str(path)) is None
+
+
+def test_npy(tmp_path, rgb):
+    path = tmp_path / "image.npy"
+    np.save(path, rgb)
+    image = open_npy(str(path))
+    assert isinstance(image, np.memmap)
+    np.testing.assert_array_equal(image, rgb)
+
+    np.save(path, rgb.reshape(-1))
+    assert open_npy(str(path)) is None
+
+
+def test_memmap_skips_other_formats(tmp_path):
+    assert open_memmap(str(tmp_path / "image.png")) is None
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.float16, np.float32])
+@pytest.mark.parametrize("channels", [1, 3, 4])
+def test_npy_supported(tmp_path, dtype, channels):
+    data = np.zeros((6, 10, channels), dtype=dtype)
+    path = tmp_path / "image.npy"
+    np.save(path, data)
+
+    image = open_npy(str(path))
+    assert image.dtype == dtype
+    assert image.shape == ((6, 10) if channels == 1 else data.shape)
+
+
+@pytest.mark.parametrize("data", [
+    np.zeros((6, 10, 2), dtype=np.uint8),
+    np.zeros((6, 10, 5), dtype=np.uint8),
+    np.zeros((6, 10), dtype=bool),
+    np.zeros((6, 10), dtype=np.int8),
+    np.zeros((6, 10, 3), dtype=np.int32),
+    np.zeros((6, 10, 3), dtype=np.float64),
+    np.zeros((6, 10, 3), dtype=np.dtype(np.uint16).newbyteorder()),
+])
+def test_npy_rejects_unsupported(tmp_path, data):
+    path = tmp_path / "image.npy"
+    np.save(path, data)
+    assert open_npy(str(path)) is None
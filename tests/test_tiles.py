@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from nande.tiles import TilePyramid, get_half_image, get_mip_level
+
+
+@pytest.mark.parametrize("scale, levels, expected", [
+    (1.0, 4, 0),
+    (0.6, 4, 0),
+    (0.5, 4, 1),
+    (0.26, 4, 1),
+    (0.25, 4, 2),
+    (0.01, 4, 3),
+    (2.0, 4, 0),
+    (0.01, 1, 0),
+])
+def test_get_mip_level(scale, levels, expected):
+    assert get_mip_level(scale, levels) == expected
+
+
+def test_get_half_image_averages():
+    image = np.array([[0, 2, 4, 8], [2, 4, 6, 10]], dtype=np.uint8)
+    np.testing.assert_array_equal(get_half_image(image), [[2, 7]])
+
+
+def test_coarse_tiles_read_strided_regions(qapp):
+    image = np.zeros((2000, 3000, 3), dtype=np.uint8)
+    shapes = []
+
+    def convert(region):
+        shapes.append(region.shape)
+        return region
+
+    pyramid = TilePyramid(image, tile_size=256, convert=convert)
+    assert pyramid.levels == 5
+
+    coarsest = pyramid.levels - 1
+    tile = pyramid.get_tile(coarsest, 0, 0)
+    assert (tile.width(), tile.height()) == (188, 125)
+    # Twice the tile resolution, not the 3000x2000 span
+    assert shapes == [(250, 375, 3)]
+
+    pyramid.get_tile(coarsest, 0, 0)
+    assert len(shapes) == 1
+    assert pyramid.stats()["hits"] == 1
+
+
+def test_tile_layout(qapp):
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (300, 500, 3), dtype=np.uint8)
+    pyramid = TilePyramid(image, tile_size=128)
+
+    tile = pyramid.get_tile(0, 1, 1)
+    assert (tile.width(), tile.height()) == (128, 128)
+    rect = pyramid.tile_rect(2, 0, 0)
+    assert (rect.width(), rect.height()) == (500, 300)
+    assert list(pyramid.visible_tiles(0, rect)) == [(tx, ty) for ty in range(3) for tx in range(4)]
@@ -0,0 +1,173 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from nande.utils import (
+    LUT_REGISTRY,
+    _get_invert_linear_color,
+    adjust_gamma,
+    apply_lut3d,
+    bake_ocio_lut,
+    check_ocio_lut_accuracy,
+    clear_ocio_buffers,
+    get_gamma_lut,
+    get_invert_color,
+    get_invert_linear_color,
+    get_lut_domain_coords,
+    get_lut_domain_values,
+    get_ocio_buffers_info,
+    ocio_transform,
+)
+
+
+@pytest.fixture()
+def image():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (32, 48, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("hdr", [False, True])
+def test_lut_domain_round_trip(hdr):
+    coords = np.linspace(0.0, 1.0, 17)
+    values = get_lut_domain_values(coords, hdr)
+    np.testing.assert_allclose(get_lut_domain_coords(values, hdr), coords, atol=1e-9)
+    assert np.all(np.diff(values) > 0)
+
+
+def test_baked_lut_matches_processor(image):
+    exact = ocio_transform(image)
+    lut = bake_ocio_lut(size=65)
+    approx = apply_lut3d(image, lut)
+
+    error = np.abs(exact.astype(int) - approx.astype(int))
+    assert error.max() <= 3
+    assert error.mean() < 0.5
+    np.testing.assert_array_equal(ocio_transform(image, lut_size=65), approx)
+
+
+def test_hdr_lut_keeps_highlights():
+    ramp = (2.0 ** np.linspace(-8.0, 4.0, 512)).astype(np.float32)
+    image = np.repeat(ramp[np.newaxis, :, np.newaxis], 3, axis=2)
+    exact = ocio_transform(image, scale=1.0)
+
+    approx = ocio_transform(image, scale=1.0, lut_size=65)
+    error = np.abs(exact.astype(int) - approx.astype(int))
+    assert error.max() <= 1
+
+    # The 0-1 domain clips everything above 1.0
+    clipped = apply_lut3d(image, bake_ocio_lut(size=65), scale=1.0)
+    assert np.abs(exact.astype(int) - clipped.astype(int)).max() > 8
+
+
+def test_hdr_lut_on_saturated_colors():
+    rng = np.random.default_rng(0)
+    image = (2.0 ** rng.uniform(-8.0, 4.0, (32, 48, 3))).astype(np.float32)
+    exact = ocio_transform(image, scale=1.0)
+
+    # Out of gamut colors interpolate worse, only the average is tight
+    approx = ocio_transform(image, scale=1.0, lut_size=65)
+    assert np.abs(exact.astype(int) - approx.astype(int)).mean() < 1.0
+
+
+
+def test_check_ocio_lut_accuracy(image):
+    result = check_ocio_lut_accuracy(image, size=65)
+    assert result["max_error"] <= 3
+
+    # Same scale and HDR domain as the graph for float images
+    ramp = (2.0 ** np.linspace(-8.0, 4.0, 512)).astype(np.float32)
+    hdr_image = np.repeat(ramp[np.newaxis, :, np.newaxis], 3, axis=2)
+    assert check_ocio_lut_accuracy(hdr_image, size=65)["max_error"] <= 1
+    assert check_ocio_lut_accuracy(hdr_image, size=65, hdr=False)["max_error"] > 8
+
+    # The HDR domain spends fewer LUT points on the 0-1 range
+    float_image = image.astype(np.float32) / 255.0
+    result = check_ocio_lut_accuracy(float_image, size=65)
+    assert result["max_error"] > check_ocio_lut_accuracy(float_image, size=65, hdr=False)["max_error"]
+    assert result["mean_error"] < 1.0
+
+def test_baked_lut_on_readonly_views(image):
+    lut = bake_ocio_lut(size=33)
+    expected = apply_lut3d(image, lut)
+
+    readonly = image.copy()
+    readonly.flags.writeable = False
+    np.testing.assert_array_equal(apply_lut3d(readonly, lut), expected)
+
+    # Reversed channel views, e.g. memory mapped RGB TIFFs
+    rgb = np.ascontiguousarray(image[..., ::-1])
+    rgb.flags.writeable = False
+    np.testing.assert_array_equal(apply_lut3d(rgb[..., ::-1], lut), expected)
+
+
+def test_invert_color():
+    gray = np.array([[0, 100, 255]], dtype=np.uint8)
+    np.testing.assert_array_equal(get_invert_color(gray), [[255, 155, 0]])
+
+
+def test_invert_linear_lut_matches_float_path(image):
+    # The table is composed from two truncated 8-bit gamma tables
+    error = np.abs(get_invert_linear_color(image).astype(int) - _get_invert_linear_color(image))
+    assert error.max() <= 4
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16])
+def test_adjust_gamma_integer(image, dtype):
+    max_value = np.iinfo(dtype).max
+    data = (image.astype(np.float64) / 255.0 * max_value).astype(dtype)
+    expected = (np.power(data / max_value, 1.0 / 2.2) * max_value).astype(dtype)
+
+    result = adjust_gamma(data, 2.2)
+    assert result.dtype == dtype
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_adjust_gamma_float():
+    rng = np.random.default_rng(0)
+    data = rng.uniform(0.0, 4.0, (8, 8, 3)).astype(np.float32)
+    result = adjust_gamma(data, 2.2)
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, data ** (1.0 / 2.2), rtol=2e-3)
+
+
+def test_gamma_lut_is_built_once():
+    table = get_gamma_lut(0.7)
+    size = len(LUT_REGISTRY)
+    assert get_gamma_lut(0.7) is table
+    assert len(LUT_REGISTRY) == size
+
+
+@pytest.mark.parametrize("invert", [get_invert_color, get_invert_linear_color])
+def test_invert_keeps_alpha(image, invert):
+    alpha = np.arange(image.shape[0] * image.shape[1], dtype=np.uint8).reshape(image.shape[:2])
+    rgba = np.dstack([image, alpha])
+
+    result = invert(rgba)
+    np.testing.assert_array_equal(result[..., 3], alpha)
+    np.testing.assert_array_equal(result[..., :3], invert(image))
+
+
+def test_ocio_buffers_are_released(image, monkeypatch):
+    data = image.astype(np.uint16) * 257
+    clear_ocio_buffers()
+    with ThreadPoolExecutor(2) as executor:
+        list(executor.map(lambda _: ocio_transform(data, threads=1), range(4)))
+        assert get_ocio_buffers_info()["nbytes"] >= data.nbytes
+
+        clear_ocio_buffers()
+        assert get_ocio_buffers_info()["nbytes"] == 0
+
+    # Big frames don't keep their buffer alive
+    monkeypatch.setattr("nande.utils.OCIO_BUFFER_MAX_BYTES", data.nbytes - 1)
+    expected = ocio_transform(data, threads=1)
+    assert get_ocio_buffers_info()["nbytes"] == 0
+    np.testing.assert_array_equal(expected, ocio_transform(data))
+
+
+def test_ocio_transform_gray(image):
+    gray = image[..., 0]
+    result = ocio_transform(gray)
+    assert result.shape == (*gray.shape, 3)
+    np.testing.assert_array_equal(result, ocio_transform(np.dstack([gray] * 3)))
+    np.testing.assert_array_equal(ocio_transform(gray, lut_size=33).shape, result.shape)
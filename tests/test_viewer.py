@@ -0,0 +1,345 @@
+import struct
+
+import cv2
+import numpy as np
+import pytest
+from PySide6.QtCore import QEvent, QEventLoop, QObject, QPoint, QPointF, Qt, QTimer
+from PySide6.QtGui import QMouseEvent
+from PySide6.QtWidgets import QGraphicsView, QWidget
+
+import nande
+from nande.utils import (
+    LUT_REGISTRY,
+    OCIO_PROCESSOR_CACHE,
+    adjust_image,
+    get_ndarray_from_qimage,
+    ocio_transform,
+)
+from nande.widgets import PROFILE_PERFORMANCE, PROFILE_QUALITY, NandeViewer
+
+
+def wait(ms: int):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+class PaintSpy(QObject):
+    """
+    Records the bounding rect of every paint event of the watched widget.
+
+    """
+    def __init__(self):
+        super().__init__()
+        self.rects = []
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint:
+            self.rects.append(event.region().boundingRect())
+        return False
+
+
+def get_shown_image(viewer: NandeViewer) -> np.ndarray:
+    image = viewer.get_pixmap_item().pixmap().toImage()
+    # BGR order like the images of the viewer, alpha dropped
+    return get_ndarray_from_qimage(image)[..., :3].copy()
+
+
+@pytest.fixture()
+def image():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (300, 400, 3), dtype=np.uint8)
+
+
+@pytest.fixture()
+def viewer(qapp, image):
+    parent = QWidget()
+    viewer = NandeViewer(parent)
+    viewer.resize(800, 600)
+    viewer._set_decoded_image(image)
+    yield viewer
+    parent.deleteLater()
+
+
+def write_jpeg(path, image: np.ndarray, orientation: int):
+    """
+    Write the image as JPEG with the given EXIF orientation tag.
+
+    """
+    data = cv2.imencode(".jpg", image)[1].tobytes()
+    # Little endian TIFF header and a single orientation (SHORT) entry
+    ifd = struct.pack("<2sHI", b"II", 42, 8)
+    ifd += struct.pack("<HHHIHHI", 1, 0x0112, 3, 1, orientation, 0, 0)
+    exif = b"Exif\0\0" + ifd
+    app1 = b"\xff\xe1" + struct.pack(">H", len(exif) + 2) + exif
+    with open(path, "wb") as f:
+        f.write(data[:2] + app1 + data[2:])
+
+
+def test_async_load_progress_and_preview(viewer, tmp_path):
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (1200, 3000, 3), dtype=np.uint8)
+    path = str(tmp_path / "rotated.jpg")
+    write_jpeg(path, image, orientation=6)
+
+    progress = []
+    previews = []
+    loaded = []
+    viewer.image_load_progress.connect(progress.append)
+    # The preview is stretched over the full res extent
+    viewer.image_preview_ready.connect(
+        lambda pixmap: previews.append((pixmap.size(), viewer.get_pixmap_item().scale()))
+    )
+    viewer.image_loaded.connect(loaded.append)
+
+    viewer.load_image_async(path)
+    for _ in range(100):
+        wait(50)
+        if loaded:
+            break
+
+    assert loaded == [path]
+    assert progress[0] == 0
+    assert progress[-2:] == [viewer.LOAD_PROGRESS_BUSY, 100]
+    assert progress[:-2] == sorted(progress[:-2])
+
+    # The preview keeps the stored orientation, like the full res image
+    assert len(previews) == 1
+    size, scale = previews[0]
+    assert (size.width(), size.height()) == (750, 300)
+    assert scale == 4.0
+    assert viewer.get_display_image().shape[:2] == (1200, 3000)
+    assert viewer.get_pixmap_item().scale() == 1.0
+
+def wait_for_fill(viewer: NandeViewer):
+    for _ in range(100):
+        wait(20)
+        if viewer._fill_worker is None:
+            return
+
+
+def test_zoomed_in_view_processes_visible_region_first(qapp):
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (2000, 3000, 3), dtype=np.uint8)
+    parent = QWidget()
+    viewer = NandeViewer(parent)
+    viewer.resize(800, 600)
+    viewer._set_decoded_image(image)
+    parent.show()
+    viewer.set_zoom(1.0)
+    wait(50)
+
+    rect = viewer._get_visible_image_rect()
+    assert rect is not None
+    assert rect.width() * rect.height() < image.shape[0] * image.shape[1] / 4
+    assert rect.top() > 0 and rect.left() > 0
+
+    viewer.view_invert_color()
+    top, left = rect.top(), rect.left()
+    bottom, right = top + rect.height(), left + rect.width()
+    shown = get_shown_image(viewer)
+    np.testing.assert_array_equal(shown[top:bottom, left:right], 255 - image[top:bottom, left:right])
+    # The rest is filled in the background
+    np.testing.assert_array_equal(shown[:top, :left], image[:top, :left])
+    assert viewer.get_view_cache_info()["size"] == 0
+
+    wait_for_fill(viewer)
+    np.testing.assert_array_equal(get_shown_image(viewer), 255 - image)
+    assert viewer.get_view_cache_info()["size"] == 1
+    parent.deleteLater()
+
+def test_heavy_operations_are_refined_progressively(viewer, image):
+    viewer.PROGRESSIVE_MIN_PIXELS = 0
+    # Every 10th pixel of the 300x400 image
+    viewer.PROGRESSIVE_PREVIEW_PIXELS = 30 * 40
+    framebuffer = get_shown_image(viewer)
+
+    viewer.use_ocio(True)
+    assert viewer._fill_worker is not None
+    low_res = get_shown_image(viewer)
+    expected = ocio_transform(image)
+    assert not np.array_equal(low_res, framebuffer)
+    assert not np.array_equal(low_res, expected)
+    np.testing.assert_array_equal(low_res[::10, ::10], expected[::10, ::10])
+
+    wait_for_fill(viewer)
+    np.testing.assert_array_equal(get_shown_image(viewer), expected)
+    assert viewer.get_view_cache_info()["size"] == 1
+
+def wait_for_mip_levels(viewer: NandeViewer) -> list:
+    item = viewer.get_pixmap_item()
+    for _ in range(100):
+        wait(20)
+        if item.get_mip_levels():
+            break
+    return item.get_mip_levels()
+
+
+def test_mip_levels_are_dropped_once_per_fill(qapp):
+    image = np.full((1200, 1600, 3), 128, dtype=np.uint8)
+    parent = QWidget()
+    viewer = NandeViewer(parent)
+    viewer.FILL_BLOCK_SIZE = 256
+    viewer.PROGRESSIVE_MIN_PIXELS = 0
+    viewer._set_decoded_image(image)
+    item = viewer.get_pixmap_item()
+    assert len(wait_for_mip_levels(viewer)) == 2
+    misses = item.get_mip_cache_info()["misses"]
+
+    updates = []
+    update_mip_levels = item.update_mip_levels
+    item.update_mip_levels = lambda: (updates.append(True), update_mip_levels())
+
+    # The fill draws 35 blocks, the levels are only rebuilt once it's done
+    viewer.use_ocio(True)
+    assert viewer._fill_worker is not None
+    assert item.get_mip_levels() == []
+    wait_for_fill(viewer)
+    assert updates == [True]
+    assert item.get_mip_cache_info()["misses"] == misses + 1
+
+    levels = wait_for_mip_levels(viewer)
+    level = get_ndarray_from_qimage(levels[0].toImage())[..., :3]
+    assert (level == ocio_transform(image[:1, :1])).all()
+    parent.deleteLater()
+
+def test_adjustments_are_coalesced(viewer, image):
+    for value in np.linspace(0.0, 0.5, 50):
+        viewer.set_adjustments(brightness=value)
+
+    assert viewer.get_adjustments() == viewer.ADJUST_NONE
+    wait(viewer.ADJUST_INTERVAL * 3)
+    assert viewer.get_adjustments()[0] == 0.5
+    assert viewer.get_graph().stats()["adjust"] == 1
+
+
+def test_dragged_adjustments_are_not_cached(viewer, image):
+    framebuffer = get_shown_image(viewer)
+    lut_count = len(LUT_REGISTRY)
+    for value in np.linspace(0.05, 0.3, 6):
+        viewer.set_adjustments(brightness=value)
+        wait(viewer.ADJUST_INTERVAL * 2)
+
+    np.testing.assert_array_equal(get_shown_image(viewer), adjust_image(image, 0.3))
+    assert viewer.get_view_cache_info()["size"] == 0
+    assert len(LUT_REGISTRY) == lut_count
+    assert viewer.get_buffer_pool_info()["allocations"] == 1
+
+    # Only the settled view gets cached, drawing in place kept the original
+    wait(viewer.ADJUST_SETTLE_DELAY * 2)
+    assert viewer.get_view_cache_info()["size"] == 1
+    viewer.reset_adjustments()
+    np.testing.assert_array_equal(get_shown_image(viewer), framebuffer)
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.float32])
+def test_prepared_ocio_processor_is_used(qapp, image, dtype):
+    parent = QWidget()
+    viewer = NandeViewer(parent)
+    viewer._set_decoded_image(image.astype(dtype))
+    config = viewer.get_ocio_config()
+    viewer.ocio_display = config.getDefaultDisplay()
+    viewer.ocio_view = config.getDefaultView(viewer.ocio_display)
+
+    OCIO_PROCESSOR_CACHE.clear()
+    viewer.prepare_ocio_processor()
+    misses = OCIO_PROCESSOR_CACHE.stats()["misses"]
+    viewer.use_ocio(True)
+    # Any other operation routes the 8-bit image to OCIO
+    viewer.view_invert_color()
+    assert OCIO_PROCESSOR_CACHE.stats()["misses"] == misses
+    parent.deleteLater()
+
+
+def drag(viewer: NandeViewer, x: float, y: float):
+    event = QMouseEvent(
+        QEvent.Type.MouseMove,
+        QPointF(x, y),
+        QPointF(x, y),
+        Qt.MouseButton.NoButton,
+        Qt.MouseButton.LeftButton,
+        Qt.KeyboardModifier.NoModifier,
+    )
+    viewer.mouseMoveEvent(event)
+
+
+def test_pan_is_coalesced(viewer):
+    viewer.LMB_state = True
+    viewer._previous_pos = QPoint(200, 200)
+    scene_range = viewer._scene_range
+    pans = []
+    viewer._set_viewer_pan = lambda x, y: pans.append((x, y))
+
+    for i in range(1, 11):
+        drag(viewer, 200 - i, 200 - 2 * i)
+
+    assert pans == []
+    wait(viewer.PAN_INTERVAL * 3)
+    assert len(pans) == 1
+    scale = viewer.get_zoom_factor()
+    assert pans[0] == pytest.approx((10 / scale, 20 / scale))
+    assert viewer._scene_range == scene_range
+
+
+@pytest.mark.parametrize(
+    "profile, cache_mode",
+    [
+        (PROFILE_PERFORMANCE, QGraphicsView.CacheModeFlag.CacheBackground),
+        (PROFILE_QUALITY, QGraphicsView.CacheModeFlag.CacheNone),
+    ],
+)
+def test_background_cache_profiles(viewer, profile, cache_mode):
+    viewer.set_performance_profile(profile)
+    assert viewer.get_performance_profile() == profile
+    assert viewer.cacheMode() == cache_mode
+    viewer.window().show()
+    viewer.set_zoom(1.0)
+    wait(50)
+
+    scene = viewer._scene
+    rects = []
+    scene.drawBackground = lambda painter, rect: (
+        rects.append(rect),
+        type(scene).drawBackground(scene, painter, rect),
+    )
+    invalidations = []
+    viewer.invalidate_background = lambda: invalidations.append(True)
+
+    for _ in range(5):
+        viewer._set_viewer_pan(10 / viewer.get_zoom_factor(), 0)
+        wait(20)
+
+    # Pans only draw the strip scrolled into view
+    assert len(rects) == 5
+    assert max(rect.width() * viewer.get_zoom_factor() for rect in rects) < 20
+    assert invalidations == []
+
+    # Item updates repaint the viewport over the cached background
+    rects.clear()
+    viewer.viewport().update()
+    wait(20)
+    if profile == PROFILE_PERFORMANCE:
+        assert rects == []
+    else:
+        assert len(rects) == 1
+
+    viewer.set_grid_size(viewer._scene._grid_size * 2)
+    assert invalidations == [True]
+
+def test_fps_counter_toggle_repaints_hud(viewer):
+    viewer.window().show()
+    wait(50)
+    spy = PaintSpy()
+    viewer.viewport().installEventFilter(spy)
+
+    for toggle in (True, False):
+        spy.rects.clear()
+        viewer.show_fps_counter(toggle)
+        wait(50)
+        assert viewer._get_hud_rect() in spy.rects
+
+
+def test_unloadable_ocio_config_is_ignored(viewer, tmp_path):
+    assert not viewer.set_ocio_config(str(tmp_path / "missing.ocio"))
+    assert viewer.ocio_config is None
+    assert viewer.get_ocio_config() is nande.get_ocio_config()
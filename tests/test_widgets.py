@@ -0,0 +1,27 @@
+import numpy as np
+
+from nande.utils import get_qpolygonf_from_ndarray
+from nande.widgets import _get_grid_lines, _get_grid_points
+
+
+def test_qpolygonf_from_ndarray(qapp):
+    points = np.array([[0.5, 1.0], [2.0, -3.25], [4.0, 5.0]])
+    polygon = get_qpolygonf_from_ndarray(points)
+
+    assert [(point.x(), point.y()) for point in polygon] == [tuple(point) for point in points]
+    assert get_qpolygonf_from_ndarray(np.empty((0, 2))).isEmpty()
+
+
+def test_grid_lines(qapp):
+    points = [(point.x(), point.y()) for point in _get_grid_lines(10, -10, 0, 20, 30)]
+    pairs = list(zip(points[::2], points[1::2]))
+    assert pairs == [
+        *(((x, 0.0), (x, 30.0)) for x in (-10.0, 0.0, 10.0, 20.0)),
+        *(((-10.0, y), (20.0, y)) for y in (0.0, 10.0, 20.0, 30.0)),
+    ]
+
+
+def test_grid_points():
+    xs, ys = _get_grid_points(10, 0, 0, 20, 10)
+    np.testing.assert_array_equal(xs, [0, 10, 20, 0, 10, 20])
+    np.testing.assert_array_equal(ys, [0, 0, 0, 10, 10, 10])